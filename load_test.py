@@ -0,0 +1,195 @@
+"""Concurrent-session load test for the NerdType dashboard.
+
+Drives simulated sessions of nerdtype_dashboard.py in-process with
+Streamlit's testing API, uploading synthetic game data, and reports rerun
+latency, peak memory and throughput at each concurrency level. Each level
+runs in its own subprocess, so its peak memory is not inflated by earlier
+levels.
+
+Example:
+    python load_test.py --concurrency 1,2,4,8 --records 5000 --reruns 3
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nerdtype_dashboard.py")
+UPLOAD_KEY = "load_test_upload"
+
+MODES = ["Classic Mode", "Speedrunner Mode", "Zen Mode"]
+WORD_LISTS = ["english", "finnish", "programming"]
+
+
+class SyntheticUpload(io.BytesIO):
+    """Stands in for the UploadedFile returned by st.file_uploader."""
+
+    name = "game-data.json"
+    type = "application/json"
+
+
+def synthetic_game_data(records, seed=0):
+    """Generate a NerdType export with the given number of sessions."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    offsets = np.sort(rng.integers(0, 365 * 24 * 3600, size=records))
+    modes = rng.choice(MODES, size=records)
+    word_lists = rng.choice(WORD_LISTS, size=records)
+    wpm = rng.normal(65, 12, size=records).clip(10, 160).round()
+    accuracy = rng.normal(94, 4, size=records).clip(50, 100).round(1)
+
+    data = []
+    for i in range(records):
+        record = {
+            "username": f"user-{seed}",
+            "wpm": int(wpm[i]),
+            "accuracy": f"{accuracy[i]:.1f}%",
+            "date": (start + timedelta(seconds=int(offsets[i]))).strftime(
+                "%d/%m/%Y, %H:%M:%S"
+            ),
+            "mode": str(modes[i]),
+            "wordList": str(word_lists[i]),
+        }
+        if record["mode"] == "Zen Mode":
+            record["totalTime"] = int(rng.integers(30, 600))
+        else:
+            record["timeLeft"] = int(rng.integers(0, 60))
+            record["score"] = int(wpm[i] * accuracy[i] / 10)
+        data.append(record)
+    return json.dumps(data).encode("utf-8")
+
+
+def fake_file_uploader(*args, **kwargs):
+    # Each simulated session carries its own upload in session state
+    return st.session_state.get(UPLOAD_KEY)
+
+
+def run_session(raw, reruns, timeout):
+    """Run one simulated session and return the latency of each rerun."""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state[UPLOAD_KEY] = SyntheticUpload(raw)
+    latencies = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return latencies
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_level(concurrency, uploads, reruns, timeout):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(run_session, uploads[i % len(uploads)], reruns, timeout)
+            for i in range(concurrency)
+        ]
+        latencies = [latency for future in futures for latency in future.result()]
+    elapsed = time.perf_counter() - started
+    return {
+        "sessions": concurrency,
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+        "reruns_per_s": len(latencies) / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8",
+        help="comma-separated numbers of concurrent sessions (default: 1,2,4,8)",
+    )
+    parser.add_argument(
+        "--records", type=int, default=1000, help="sessions per synthetic upload"
+    )
+    parser.add_argument(
+        "--reruns", type=int, default=3, help="script reruns per simulated session"
+    )
+    parser.add_argument(
+        "--distinct",
+        action="store_true",
+        help="give every session its own dataset instead of one shared upload",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120, help="seconds allowed per rerun"
+    )
+    # Internal: run a single level and print its result as JSON
+    parser.add_argument("--level", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def run_level_in_subprocess(level, args):
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--level", str(level),
+        "--concurrency", args.concurrency,
+        "--records", str(args.records),
+        "--reruns", str(args.reruns),
+        "--timeout", str(args.timeout),
+    ]
+    if args.distinct:
+        command.append("--distinct")
+    output = subprocess.run(
+        command, check=True, stdout=subprocess.PIPE, text=True
+    ).stdout
+    # The result is the last line; anything before it is app output
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    datasets = max(levels) if args.distinct else 1
+
+    if args.level is not None:
+        uploads = [synthetic_game_data(args.records, seed) for seed in range(datasets)]
+        # AppTest sessions are created off the script thread, which Streamlit warns about
+        logging.getLogger(
+            "streamlit.runtime.scriptrunner_utils.script_run_context"
+        ).setLevel(logging.ERROR)
+        # The app script resolves its images relative to the working directory
+        os.chdir(os.path.dirname(APP_PATH))
+        with mock.patch("streamlit.file_uploader", fake_file_uploader):
+            result = run_level(args.level, uploads, args.reruns, args.timeout)
+        print(json.dumps(result))
+        return
+
+    print(
+        f"{args.records} records per upload, {datasets} distinct dataset(s), "
+        f"{args.reruns} rerun(s) per session"
+    )
+    print(f"{'sessions':>8} {'p50 ms':>9} {'p99 ms':>9} {'reruns/s':>9} {'peak RSS MB':>12}")
+    for level in levels:
+        result = run_level_in_subprocess(level, args)
+        print(
+            f"{result['sessions']:>8} {result['p50_ms']:>9.0f} "
+            f"{result['p99_ms']:>9.0f} {result['reruns_per_s']:>9.2f} "
+            f"{result['peak_rss_mb']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,11 @@
+import hashlib
 import json
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
 import numpy as np
 import pandas as pd
@@ -166,31 +173,1524 @@ st.markdown(
 
 
 
+# Fields every session record must carry to be plotted
+REQUIRED_FIELDS = ["date", "wpm", "accuracy", "mode", "wordList"]
+DATE_FORMAT = "%d/%m/%Y, %H:%M:%S"
+# Far above any human typing speed; higher values are corrupt records
+MAX_WPM = 1000
+
+
+def validate_sessions(df):
+    """Coerce and validate session records column-wise in a single pass.
+
+    Returns the cleaned frame together with the quarantined rows, each
+    tagged with the first check it failed.
+    """
+    missing = [field for field in REQUIRED_FIELDS if field not in df.columns]
+    if missing:
+        raise ValueError(f"missing required field(s): {', '.join(missing)}")
+
+    # Coerce every column once; unparseable values become NaN/NaT
+    date = pd.to_datetime(df["date"], format=DATE_FORMAT, errors="coerce")
+    wpm = pd.to_numeric(df["wpm"], errors="coerce")
+    accuracy = pd.to_numeric(
+        df["accuracy"].astype(str).str.strip().str.rstrip("%"), errors="coerce"
+    )
+    mode = df["mode"].where(df["mode"].notna()).astype("string").str.strip()
+    word_list = (
+        df["wordList"].where(df["wordList"].notna()).astype("string").str.strip()
+    )
+
+    # Each check is a boolean mask of the rows that fail it
+    checks = {
+        "invalid date": date.isna(),
+        "invalid wpm": wpm.isna() | ~np.isfinite(wpm) | (wpm < 0) | (wpm > MAX_WPM),
+        "invalid accuracy": accuracy.isna() | (accuracy < 0) | (accuracy > 100),
+        "missing mode": mode.isna() | (mode == "").fillna(True),
+        "missing word list": word_list.isna() | (word_list == "").fillna(True),
+    }
+    masks = [mask.to_numpy(dtype=bool) for mask in checks.values()]
+    bad = np.logical_or.reduce(masks)
+
+    rejected = df[bad].copy()
+    rejected.insert(
+        0, "reason", np.select(masks, list(checks), default="")[bad]
+    )
+
+    df = df[~bad].copy()
+    df["date"] = date[~bad]
+    # Extract just the date part for grouping
+    df["day"] = df["date"].dt.date
+    df["wpm"] = wpm[~bad]
+    df["accuracy"] = accuracy[~bad]
+    df["mode"] = mode[~bad].astype(object)
+    df["wordList"] = word_list[~bad].astype(object)
+
+    # Zen Mode entries carry totalTime instead of timeLeft and score
+    for field in ["timeLeft", "score", "totalTime"]:
+        if field in df.columns:
+            values = pd.to_numeric(df[field], errors="coerce")
+            # Overflowing values such as 1e400 parse as inf; treat them as missing
+            df[field] = values.where(np.isfinite(values))
+        else:
+            df[field] = np.nan
+    df["timeLeft"] = df["timeLeft"].fillna(0)
+    df["is_zen_mode"] = df["mode"] == "Zen Mode"
+    return df.reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+# Metric -> (bin width, upper bound) of the histogram sketching it
+SKETCH_BINS = {"wpm": (1.0, 400.0), "accuracy": (0.1, 100.0)}
+SKETCH_DIMENSIONS = {"mode": "Game Mode", "wordList": "Word List", "username": "User"}
+SKETCH_QUANTILES = [0.5, 0.9, 0.99]
+
+
+class SessionSketches:
+    """Mergeable quantile sketches of WPM and accuracy per group and month.
+
+    Each sketch is a histogram over fixed-width bins at display resolution,
+    so quantiles are exact to that resolution, memory grows with the number
+    of groups and months rather than sessions, and sketches from different
+    files or date ranges combine by adding their counts. Values above the
+    top bin are counted in it; clipped records how many sessions that
+    affected.
+    """
+
+    def __init__(self, months, groups, counts, clipped):
+        self.months = months  # sorted datetime64[M] array
+        self.groups = groups  # dimension -> sorted array of group labels
+        self.counts = counts  # (dimension, metric) -> (groups, months, bins)
+        self.clipped = clipped  # metric -> sessions above the top bin
+
+    @classmethod
+    def from_frame(cls, df):
+        months, month_codes = np.unique(
+            df["date"].to_numpy().astype("datetime64[M]"), return_inverse=True
+        )
+        groups, counts = {}, {}
+        clipped = {
+            metric: int((df[metric] > upper).sum())
+            for metric, (_, upper) in SKETCH_BINS.items()
+        }
+        for dimension in SKETCH_DIMENSIONS:
+            if dimension not in df.columns:
+                continue
+            labels, group_codes = np.unique(
+                df[dimension].fillna("unknown").astype(str).to_numpy(),
+                return_inverse=True,
+            )
+            groups[dimension] = labels
+            cells = group_codes * len(months) + month_codes
+            for metric, (width, upper) in SKETCH_BINS.items():
+                n_bins = int(round(upper / width)) + 1
+                bins = np.clip(
+                    np.rint(df[metric].to_numpy(dtype=float) / width), 0, n_bins - 1
+                ).astype(np.int64)
+                counts[dimension, metric] = np.bincount(
+                    cells * n_bins + bins, minlength=len(labels) * len(months) * n_bins
+                ).astype(np.int32).reshape(len(labels), len(months), n_bins)
+        return cls(months, groups, counts, clipped)
+
+    @property
+    def nbytes(self):
+        return sum(counts.nbytes for counts in self.counts.values())
+
+    def merge(self, other):
+        """Combine with the sketches of another file or date range."""
+        months = np.union1d(self.months, other.months)
+        groups, counts = {}, {}
+        for dimension in SKETCH_DIMENSIONS:
+            sketches = [s for s in (self, other) if dimension in s.groups]
+            if not sketches:
+                continue
+            labels = np.unique(np.concatenate([s.groups[dimension] for s in sketches]))
+            groups[dimension] = labels
+            for metric in SKETCH_BINS:
+                shape = (len(labels), len(months), sketches[0].counts[dimension, metric].shape[2])
+                merged = np.zeros(shape, dtype=np.int32)
+                for sketch in sketches:
+                    # Place each sketch's groups and months on the merged axes
+                    rows = np.searchsorted(labels, sketch.groups[dimension])
+                    cols = np.searchsorted(months, sketch.months)
+                    merged[np.ix_(rows, cols)] += sketch.counts[dimension, metric]
+                counts[dimension, metric] = merged
+        clipped = {metric: self.clipped[metric] + other.clipped[metric] for metric in SKETCH_BINS}
+        return SessionSketches(months, groups, counts, clipped)
+
+    def histogram(self, dimension, metric, start=None, end=None):
+        """Per-group bin counts over the months between start and end."""
+        keep = np.ones(len(self.months), dtype=bool)
+        if start is not None:
+            keep &= self.months >= np.datetime64(start, "M")
+        if end is not None:
+            keep &= self.months <= np.datetime64(end, "M")
+        return self.counts[dimension, metric][:, keep].sum(axis=1)
+
+    @staticmethod
+    def quantiles(histogram, metric, qs=SKETCH_QUANTILES):
+        """Quantiles of each histogram row, NaN for empty rows."""
+        width = SKETCH_BINS[metric][0]
+        cumulative = histogram.cumsum(axis=-1)
+        total = cumulative[..., -1:]
+        result = {}
+        for q in qs:
+            rank = np.maximum(np.ceil(q * total), 1)
+            index = (cumulative < rank).sum(axis=-1)
+            values = np.round(index * width, 6)
+            result[q] = np.where(total[..., 0] > 0, values, np.nan)
+        return result
+
+    def overall(self, metric, start=None, end=None, qs=SKETCH_QUANTILES):
+        histogram = self.histogram("mode", metric, start, end).sum(axis=0)
+        return self.quantiles(histogram, metric, qs)
+
+    def summary(self, dimension, start=None, end=None, qs=SKETCH_QUANTILES):
+        """Sessions and WPM/accuracy percentiles for each group of a dimension."""
+        table = {SKETCH_DIMENSIONS[dimension]: self.groups[dimension]}
+        table["Sessions"] = self.histogram(dimension, "wpm", start, end).sum(axis=1)
+        for metric, label in [("wpm", "WPM"), ("accuracy", "Accuracy")]:
+            histogram = self.histogram(dimension, metric, start, end)
+            for q, values in self.quantiles(histogram, metric, qs).items():
+                table[f"{label} p{q * 100:g}"] = values
+        table = pd.DataFrame(table)
+        return table[table["Sessions"] > 0].reset_index(drop=True)
+
+
+def parse_sessions(raw):
+    """Parse an exported JSON payload into a validated sessions frame."""
+    data = json.loads(raw.decode("utf-8"))
+    if not isinstance(data, list):
+        raise ValueError("expected a JSON array of session records")
+    records = [record for record in data if isinstance(record, dict)]
+    df, rejected = validate_sessions(pd.DataFrame(records))
+    report = rejected["reason"].value_counts().to_dict()
+    if len(records) < len(data):
+        report["not a record"] = len(data) - len(records)
+    return df, rejected, report, SessionSketches.from_frame(df)
+
+
+# Memory budget for the process-wide dataset cache, shared by all sessions
+CACHE_BUDGET_BYTES = int(os.environ.get("NERDTYPE_CACHE_BUDGET_MB", "512")) * 1024**2
+
+
+def nbytes(value):
+    """Approximate in-memory size of a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(nbytes(item) for item in value.values())
+    return getattr(value, "nbytes", 0)
+
+
+class SharedFrameCache:
+    """Process-wide cache of parsed uploads and the aggregates built on them.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes, so every session
+    viewing the same export shares a single copy. Cached frames are shared
+    between sessions and must be treated as read-only. Each entry counts the
+    sessions currently holding it; once the memory budget is exceeded,
+    unreferenced entries are evicted least recently used first.
+
+    Releases may come from garbage collection on any thread, possibly one
+    already holding the lock, so they are only queued and are applied on
+    the next lookup.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Keys released by leases, appended without taking the lock
+        self._released = deque()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def fetch(self, key, build, acquire=False):
+        """Return the dataset for key, parsing it with build() on a miss."""
+        with self._lock:
+            self._apply_releases()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                entry["refs"] += int(acquire)
+                return entry["value"]
+        # Parse outside the lock so other sessions are not blocked meanwhile
+        value = build()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = {"value": value, "aggregates": {}, "refs": 0}
+                entry["nbytes"] = nbytes(value)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            entry["refs"] += int(acquire)
+            self._evict()
+            return entry["value"]
+
+    def aggregate(self, key, name, compute):
+        """Return the named aggregate of a cached dataset, computing it once."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name in entry["aggregates"]:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry["aggregates"][name]
+        result = compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name not in entry["aggregates"]:
+                self.misses += 1
+                self._entries.move_to_end(key)
+                entry["aggregates"][name] = result
+                entry["nbytes"] += nbytes(result)
+                self._evict()
+        return result
+
+    def release(self, key):
+        # deque.append is atomic, so this is safe from any thread at any time
+        self._released.append(key)
+
+    def _apply_releases(self):
+        # Caller holds the lock
+        while self._released:
+            entry = self._entries.get(self._released.popleft())
+            if entry is not None:
+                entry["refs"] = max(entry["refs"] - 1, 0)
+        self._evict()
+
+    def _evict(self):
+        # Caller holds the lock; datasets still in use are never evicted
+        total = sum(entry["nbytes"] for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry["refs"] == 0:
+                total -= entry["nbytes"]
+                del self._entries[key]
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            self._apply_releases()
+            lookups = self.hits + self.misses
+            return {
+                "datasets": len(self._entries),
+                "sessions": sum(entry["refs"] for entry in self._entries.values()),
+                "bytes": sum(entry["nbytes"] for entry in self._entries.values()),
+                "budget_bytes": self.budget_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+class DatasetLease:
+    """A session's reference to a cached dataset.
+
+    Stored in session state, so the reference is dropped either explicitly
+    or when the session ends and its state is garbage collected.
+    """
+
+    def __init__(self, cache, key):
+        self.key = key
+        self._finalizer = weakref.finalize(self, cache.release, key)
+
+    def release(self):
+        self._finalizer()
+
+
+@st.cache_resource
+def get_shared_cache():
+    return SharedFrameCache(CACHE_BUDGET_BYTES)
+
+
+def release_dataset():
+    lease = st.session_state.pop("dataset_lease", None)
+    if lease is not None:
+        lease.release()
+
+
+def dataset_aggregator():
+    """Return an aggregate(name, compute) function for the current dataset.
+
+    The session's lease is resolved here, on the script thread, so the
+    returned function can be used from section worker threads.
+    """
+    lease = st.session_state.get("dataset_lease")
+    if lease is None:
+        return lambda name, compute: compute()
+    return partial(get_shared_cache().aggregate, lease.key)
+
+
 # Load and prepare data
 def load_data(uploaded_file):
+    raw = uploaded_file.getvalue()
+    key = hashlib.sha256(raw).hexdigest()
+    cache = get_shared_cache()
+    lease = st.session_state.get("dataset_lease")
+    new_dataset = lease is None or lease.key != key
     try:
-        data = json.loads(uploaded_file.getvalue().decode("utf-8"))
-        df = pd.DataFrame(data)
-        # Convert date strings to datetime
-        df["date"] = pd.to_datetime(df["date"], format="%d/%m/%Y, %H:%M:%S")
-        # Extract just the date part for grouping
-        df["day"] = df["date"].dt.date
-        # Convert accuracy from string to float
-        df["accuracy"] = df["accuracy"].str.rstrip("%").astype(float)
-        # Set timeLeft to 0 for entries that don't have it
-        if "timeLeft" not in df.columns:
-            df["timeLeft"] = 0
-        # Handle Zen Mode where there's totalTime instead of timeLeft and score
-        if "totalTime" in df.columns:
-            # Mark Zen Mode entries
-            df["is_zen_mode"] = df["mode"] == "Zen Mode"
-            # Fill missing scores with NaN
-            if "score" not in df.columns:
-                df["score"] = np.nan
-        return df
-    except Exception as e:
+        df, rejected, report, sketches = cache.fetch(
+            key, lambda: parse_sessions(raw), acquire=new_dataset
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        release_dataset()
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), None
+    if new_dataset:
+        release_dataset()
+        st.session_state["dataset_lease"] = DatasetLease(cache, key)
+        # Reset selections that refer to the previous dataset
+        for state_key in ("current_period", "previous_period", "explorer_focus", "explorer_page"):
+            st.session_state.pop(state_key, None)
+
+    if report:
+        skipped = sum(report.values())
+        summary = ", ".join(f"{reason}: {count}" for reason, count in report.items())
+        st.warning(f"Skipped {skipped} invalid session(s) ({summary}).")
+        if not rejected.empty:
+            with st.expander("Show skipped sessions"):
+                st.dataframe(rejected.astype(str), use_container_width=True)
+    return df, sketches
+
+
+class PeriodTable:
+    """Prefix sums of daily session stats per game mode and word list.
+
+    The arrays cover every day between the first and last session, so the
+    count, mean and standard deviation over any date range come from two
+    lookups per combination, however long the history is.
+    """
+
+    # Prefix-summed series: name -> (column, power)
+    SERIES = {
+        "count": (None, 0),
+        "wpm_sum": ("wpm", 1),
+        "wpm_sq": ("wpm", 2),
+        "accuracy_sum": ("accuracy", 1),
+        "accuracy_sq": ("accuracy", 2),
+    }
+
+    def __init__(self, origin, combos, prefix):
+        self.origin = origin  # datetime64[D] of the first session
+        self.combos = combos  # frame of (mode, wordList) combinations
+        self.prefix = prefix  # series name -> (combos, days + 1) prefix sums
+
+    @classmethod
+    def from_frame(cls, df):
+        days = df["date"].to_numpy().astype("datetime64[D]")
+        origin = days.min()
+        day_index = (days - origin).astype(np.int64)
+        n_days = int(day_index.max()) + 1
+        grouped = df.groupby(["mode", "wordList"], sort=True)
+        combos = grouped.size().reset_index()[["mode", "wordList"]]
+        cells = grouped.ngroup().to_numpy() * n_days + day_index
+
+        prefix = {}
+        for name, (column, power) in cls.SERIES.items():
+            weights = None if column is None else df[column].to_numpy(dtype=float) ** power
+            daily = np.bincount(
+                cells, weights=weights, minlength=len(combos) * n_days
+            ).reshape(len(combos), n_days)
+            prefix[name] = np.concatenate(
+                [np.zeros((len(combos), 1)), daily.cumsum(axis=1)], axis=1
+            )
+        return cls(origin, combos, prefix)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.prefix.values())
+
+    def _range_totals(self, start, end):
+        n_days = self.prefix["count"].shape[1] - 1
+        first = int((np.datetime64(start, "D") - self.origin).astype(np.int64))
+        last = int((np.datetime64(end, "D") - self.origin).astype(np.int64)) + 1
+        first, last = np.clip([first, last], 0, n_days)
+        last = max(first, last)
+        return {name: array[:, last] - array[:, first] for name, array in self.prefix.items()}
+
+    @staticmethod
+    def _describe(totals):
+        count = totals["count"]
+        stats = {"sessions": count.astype(np.int64)}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for metric in ["wpm", "accuracy"]:
+                mean = totals[f"{metric}_sum"] / count
+                variance = (totals[f"{metric}_sq"] - count * mean**2) / (count - 1)
+                stats[f"{metric}_mean"] = np.where(count > 0, mean, np.nan)
+                stats[f"{metric}_std"] = np.where(
+                    count > 1, np.sqrt(np.maximum(variance, 0)), np.nan
+                )
+        return stats
+
+    def range_stats(self, start, end):
+        """Sessions, mean and std of WPM/accuracy per combination in [start, end]."""
+        stats = self._describe(self._range_totals(start, end))
+        return self.combos.assign(**stats)
+
+    def overall_stats(self, start, end):
+        totals = self._range_totals(start, end)
+        stats = self._describe({name: values.sum(keepdims=True) for name, values in totals.items()})
+        return {name: values[0] for name, values in stats.items()}
+
+    def compare(self, current, previous):
+        """Per-combination stats for two date ranges with their differences."""
+        now = self.range_stats(*current)
+        before = self.range_stats(*previous)
+        table = now.merge(
+            before, on=["mode", "wordList"], suffixes=("", "_previous")
+        )
+        table["wpm_change"] = table["wpm_mean"] - table["wpm_mean_previous"]
+        table["accuracy_change"] = table["accuracy_mean"] - table["accuracy_mean_previous"]
+        active = (table["sessions"] > 0) | (table["sessions_previous"] > 0)
+        return table[active].reset_index(drop=True)
+
+
+class SessionIndex:
+    """Precomputed sort orders and filter codes for paging through sessions.
+
+    Every sort order is computed once per dataset. Filters select positions
+    within an existing order, and a day's sessions are a contiguous run of
+    the date order, so serving a page never re-sorts the frame and only the
+    rows on that page are materialized.
+    """
+
+    SORT_COLUMNS = {"Date": "date", "WPM": "wpm", "Accuracy": "accuracy", "Score": "score"}
+
+    def __init__(self, df):
+        self.df = df
+        self.orders = {
+            column: np.argsort(df[column].to_numpy(), kind="stable")
+            for column in self.SORT_COLUMNS.values()
+        }
+        # Sorted calendar days of the date order, for binary search
+        self.days = df["date"].to_numpy()[self.orders["date"]].astype("datetime64[D]")
+        self.codes, self.labels = {}, {}
+        for column in ["mode", "wordList"]:
+            self.codes[column], self.labels[column] = pd.factorize(df[column])
+        self.combos = {
+            f"{mode} - {word_list}": (mode, word_list)
+            for mode, word_list in df[["mode", "wordList"]].drop_duplicates().itertuples(index=False)
+        }
+
+    @property
+    def nbytes(self):
+        arrays = [*self.orders.values(), self.days, *self.codes.values()]
+        return sum(array.nbytes for array in arrays)
+
+    def order(self, column, descending=False):
+        order = self.orders[column]
+        if not descending:
+            return order
+        # Reverse the order but keep missing values (sorted last) at the end
+        valid = np.count_nonzero(self.df[column].notna())
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+
+    def day_rows(self, day):
+        """Rows of one calendar day, found by binary search on the date order."""
+        day = np.datetime64(day, "D")
+        first, last = np.searchsorted(self.days, [day, day + 1])
+        return self.orders["date"][first:last]
+
+    def query(self, sort="date", descending=False, modes=None, word_lists=None, day=None):
+        """Row positions matching the filters, in the requested order.
+
+        A filter of None matches every session; a list matches only the
+        sessions with one of its values, so an empty list matches none.
+        """
+        order = self.order(sort, descending)
+        selected = np.ones(len(self.df), dtype=bool)
+        if day is not None:
+            rows = self.day_rows(day)
+            if sort == "date" and modes is None and word_lists is None:
+                return rows[::-1] if descending else rows
+            selected[:] = False
+            selected[rows] = True
+        for column, values in [("mode", modes), ("wordList", word_lists)]:
+            if values is not None:
+                wanted = np.flatnonzero(self.labels[column].isin(values))
+                selected &= np.isin(self.codes[column], wanted)
+        return order[selected[order]]
+
+    def page(self, rows, page, page_size):
+        """Materialize only the sessions on one page of the query result."""
+        return self.df.iloc[rows[(page - 1) * page_size:page * page_size]]
+
+
+def combine_filters(*selections):
+    """Values allowed by every non-empty selection, or None if none applies."""
+    selections = [set(selection) for selection in selections if selection]
+    if not selections:
+        return None
+    return list(set.intersection(*selections))
+
+
+def daily_mean(df, column):
+    daily = df.groupby("day")[column].mean().reset_index()
+    daily["day"] = pd.to_datetime(daily["day"])
+    return daily
+
+
+def style_axes(fig):
+    # Update grid and axes colors
+    fig.update_xaxes(
+        gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
+    )
+    fig.update_yaxes(
+        gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
+    )
+    return fig
+
+
+# Trace attributes holding per-point numeric data
+TRACE_ARRAYS = ["x", "y", "z", "customdata", "marker.color", "marker.size"]
+
+
+def compact_array(values):
+    """Narrow whole-number data to the smallest integer dtype that holds it.
+
+    Plotly serializes numpy arrays as typed binary buffers, so WPM, scores
+    and counts ship in one or two bytes per point instead of eight. Other
+    values, including fractional floats, are returned unchanged.
+    """
+    array = np.asarray(values)
+    if array.ndim == 0 or array.size == 0 or array.dtype.kind not in "iuf":
+        return values
+    if array.dtype.kind == "f":
+        if not (np.isfinite(array).all() and (array == np.round(array)).all()):
+            return values
+        array = array.astype(np.int64)
+    low, high = array.min(), array.max()
+    for dtype in [np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32]:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array
+
+
+def compact_figure(fig):
+    for trace in fig.data:
+        for name in TRACE_ARRAYS:
+            try:
+                values = trace[name]
+            except (KeyError, ValueError):
+                continue
+            if values is not None and not isinstance(values, str):
+                # Plotly ignores assignments equal to the current value, which
+                # would keep integral float64 arrays from being narrowed
+                trace[name] = None
+                trace[name] = compact_array(values)
+    return fig
+
+
+def build_section(build, df, aggregate):
+    """Build a section's figures and compact them for serialization."""
+    result = build(df, aggregate)
+    if isinstance(result, go.Figure):
+        return compact_figure(result)
+    if isinstance(result, dict):
+        return {
+            name: compact_figure(fig) if isinstance(fig, go.Figure) else fig
+            for name, fig in result.items()
+        }
+    return result
+
+
+# Section builders run on worker threads: they only compute figures and must
+# not call Streamlit, which is bound to the script thread.
+def build_trend_figures(df, aggregate):
+    # Ensure the data is sorted by date
+    df_time = df.sort_values("date")
+    figures = {}
+
+    # Group by day and calculate mean WPM
+    daily_wpm = aggregate("daily_wpm", lambda: daily_mean(df_time, "wpm")).copy()
+
+    # Create the Plotly line chart for WPM using theme colors
+    fig_wpm = px.line(
+        daily_wpm,
+        x="day",
+        y="wpm",
+        title="Average WPM by Day",
+        labels={"day": "Date", "wpm": "Words Per Minute"},
+        line_shape="linear",
+        color_discrete_sequence=[theme["primary"]],
+    )
+
+    # Add markers and improve layout
+    fig_wpm.update_traces(mode="lines+markers", marker=dict(size=8))
+    fig_wpm.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Words Per Minute (WPM)",
+        hovermode="x unified",
+        height=500,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    style_axes(fig_wpm)
+
+    # Add a simple moving average line
+    window_size = min(5, len(daily_wpm))
+    if window_size > 1:
+        daily_wpm["wpm_ma"] = (
+            daily_wpm["wpm"].rolling(window=window_size, min_periods=1).mean()
+        )
+        fig_wpm.add_trace(
+            go.Scatter(
+                x=daily_wpm["day"],
+                y=daily_wpm["wpm_ma"],
+                mode="lines",
+                line=dict(color=theme["accent"], dash="dash", width=2),
+                name=f"{window_size}-Day Moving Average",
+            )
+        )
+    figures["wpm"] = fig_wpm
+
+    # Group by day and calculate mean accuracy
+    daily_accuracy = aggregate(
+        "daily_accuracy", lambda: daily_mean(df_time, "accuracy")
+    )
+
+    # Create the Plotly line chart for Accuracy
+    fig_accuracy = px.line(
+        daily_accuracy,
+        x="day",
+        y="accuracy",
+        title="Average Accuracy by Day",
+        labels={"day": "Date", "accuracy": "Accuracy (%)"},
+        line_shape="linear",
+        color_discrete_sequence=[theme["primary"]],
+    )
+
+    # Add markers and improve layout
+    fig_accuracy.update_traces(mode="lines+markers", marker=dict(size=8))
+    fig_accuracy.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Accuracy (%)",
+        hovermode="x unified",
+        height=500,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    style_axes(fig_accuracy)
+
+    # Add a trend line
+    trend = px.scatter(
+        daily_accuracy,
+        x="day",
+        y="accuracy",
+        trendline="ols",
+        color_discrete_sequence=[theme["accent"]],
+    ).data[1]
+    trend.update(hovertemplate="Trend: %{y:.1f}%<extra></extra>", name="Trend Line")
+    fig_accuracy.add_trace(trend)
+    figures["accuracy"] = fig_accuracy
+
+    # Filter out Zen Mode data (which doesn't have scores)
+    df_with_score = df_time[df_time["mode"] != "Zen Mode"]
+    figures["score"] = None
+
+    if df_with_score["score"].notna().any():
+        # Group by day and calculate mean score
+        daily_score = aggregate(
+            "daily_score", lambda: daily_mean(df_with_score, "score")
+        )
+
+        # Create the Plotly line chart for Score
+        fig_score = px.line(
+            daily_score,
+            x="day",
+            y="score",
+            title="Average Score by Day",
+            labels={"day": "Date", "score": "Score"},
+            line_shape="linear",
+            color_discrete_sequence=[theme["primary"]],
+        )
+
+        # Add markers and improve layout
+        fig_score.update_traces(mode="lines+markers", marker=dict(size=8))
+        fig_score.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Score",
+            hovermode="x unified",
+            height=500,
+            paper_bgcolor=theme["background"],
+            plot_bgcolor=theme["background"],
+            font=dict(color=theme["text"]),
+        )
+        style_axes(fig_score)
+
+        # Add a trend line
+        trend = px.scatter(
+            daily_score,
+            x="day",
+            y="score",
+            trendline="ols",
+            color_discrete_sequence=[theme["accent"]],
+        ).data[1]
+        trend.update(hovertemplate="Trend: %{y:.0f}<extra></extra>", name="Trend Line")
+        fig_score.add_trace(trend)
+        figures["score"] = fig_score
+
+    return figures
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def practice_grid(df):
+    """Session count and mean WPM/accuracy per weekday and hour of day."""
+    # One integer bin per (weekday, hour), so the grid is always 7x24
+    bins = (df["date"].dt.weekday * 24 + df["date"].dt.hour).to_numpy()
+    count = np.bincount(bins, minlength=7 * 24)
+    grid = {"count": count.reshape(7, 24)}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for column in ["wpm", "accuracy"]:
+            total = np.bincount(bins, weights=df[column].to_numpy(dtype=float), minlength=7 * 24)
+            grid[column] = (total / count).reshape(7, 24)
+    return grid
+
+
+def build_practice_heatmaps(df, aggregate):
+    grid = aggregate("practice_grid", lambda: practice_grid(df))
+    figures = {}
+    for metric, label, hover_format in [
+        ("count", "Sessions", ":.0f"),
+        ("wpm", "Average WPM", ":.1f"),
+        ("accuracy", "Average Accuracy (%)", ":.1f"),
+    ]:
+        fig_heatmap = go.Figure(go.Heatmap(
+            z=grid[metric],
+            x=list(range(24)),
+            y=WEEKDAYS,
+            customdata=grid["count"],
+            colorscale="Viridis",
+            colorbar=dict(title=label),
+            hoverongaps=False,
+            hovertemplate=f"<b>%{{y}} %{{x}}:00</b><br>{label}: %{{z{hover_format}}}<br>Sessions: %{{customdata}}<extra></extra>"
+        ))
+
+        fig_heatmap.update_layout(
+            title=f"{label} by Weekday and Hour",
+            xaxis_title="Hour of Day",
+            yaxis_title="Weekday",
+            height=400,
+            paper_bgcolor=theme["background"],
+            plot_bgcolor=theme["background"],
+            font=dict(color=theme["text"]),
+            xaxis=dict(dtick=1),
+            yaxis=dict(autorange="reversed"),
+        )
+        figures[metric] = style_axes(fig_heatmap)
+    return figures
+
+
+def build_scatter_figure(df, aggregate):
+    # Create scatter plot - simplified version to avoid validation errors
+    fig_scatter = px.scatter(
+        df,
+        x="accuracy",
+        y="wpm",
+        color="mode",
+        title="WPM vs Accuracy by Game Mode",
+        labels={
+            "accuracy": "Accuracy (%)",
+            "wpm": "Words Per Minute",
+            "mode": "Game Mode"
+        },
+        color_discrete_sequence=theme["chart_colors"]
+    )
+
+    fig_scatter.update_layout(
+        xaxis_title="Accuracy (%)",
+        yaxis_title="Words Per Minute (WPM)",
+        height=500,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    return style_axes(fig_scatter)
+
+
+# Shortest run of sessions that can form its own learning-curve segment
+CHANGEPOINT_MIN_SESSIONS = 5
+# Cost of each extra segment in multiples of log(n); at 2, as in BIC, about
+# a third of histories without any real change still get split on noise
+CHANGEPOINT_PENALTY = 3
+# Longer histories use binary segmentation, since PELT's pruning degrades
+# towards quadratic time on long stretches without any changepoint
+PELT_MAX_SESSIONS = 10000
+
+
+def segment_cost(x):
+    """Return cost(start, end) of fitting one mean and variance to x[start:end].
+
+    Costs come from cumulative sums of the values and their squares, so each
+    is O(1) and either bound may be an array of positions.
+    """
+    sums = np.concatenate([[0.0], np.cumsum(x)])
+    squares = np.concatenate([[0.0], np.cumsum(x**2)])
+    # Floor the variance so constant runs do not get an infinitely low cost
+    var_floor = max(x.var() * 1e-3, 1e-6)
+
+    def cost(start, end):
+        length = end - start
+        mean = (sums[end] - sums[start]) / length
+        variance = (squares[end] - squares[start]) / length - mean**2
+        return length * np.log(np.maximum(variance, var_floor))
+
+    return cost
+
+
+def pelt(cost, n, penalty, min_size):
+    """Optimal changepoints by PELT, pruning starts that can no longer win."""
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0])
+    for end in range(min_size, n + 1):
+        admissible = end - candidates >= min_size
+        starts = candidates[admissible]
+        totals = best[starts] + cost(starts, end)
+        i = np.argmin(totals)
+        best[end] = totals[i] + penalty
+        previous[end] = starts[i]
+        # Drop starts that can never beat the current optimum again, always
+        # keeping the best one so a NaN cost cannot empty the candidates
+        keep = totals <= best[end]
+        keep[i] = True
+        candidates = np.concatenate(
+            [starts[keep], candidates[~admissible], [end]]
+        )
+
+    changepoints = []
+    end = previous[n]
+    while end > 0:
+        changepoints.append(int(end))
+        end = previous[end]
+    return changepoints
+
+
+def binary_segmentation(cost, n, penalty, min_size):
+    """Changepoints by recursively taking the best split while it pays off."""
+    changepoints = []
+    pending = [(0, n)]
+    while pending:
+        start, end = pending.pop()
+        splits = np.arange(start + min_size, end - min_size + 1)
+        if len(splits) == 0:
+            continue
+        gains = cost(start, end) - cost(start, splits) - cost(splits, end)
+        i = np.argmax(gains)
+        if gains[i] > penalty:
+            changepoints.append(int(splits[i]))
+            pending += [(start, splits[i]), (splits[i], end)]
+    return changepoints
+
+
+def detect_changepoints(values, min_size=CHANGEPOINT_MIN_SESSIONS):
+    """Split a series into segments of distinct mean and variance.
+
+    Returns (start, end) index pairs, end exclusive.
+    """
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    # Non-finite values, or squares overflowing, would make segment costs NaN
+    with np.errstate(over="ignore", invalid="ignore"):
+        finite = np.isfinite(np.sum(x**2))
+    if n < 2 * min_size or not finite:
+        return [(0, n)]
+    # Penalty for the mean, variance and position of each new segment
+    penalty = CHANGEPOINT_PENALTY * np.log(n)
+    search = pelt if n <= PELT_MAX_SESSIONS else binary_segmentation
+    bounds = [0] + sorted(search(segment_cost(x), n, penalty, min_size)) + [n]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def learning_segments(df_sorted, column):
+    """Changepoint segments of each group's WPM history, with segment means."""
+    segments = {}
+    for name, group in df_sorted.groupby(column, sort=False):
+        wpm = group["wpm"].to_numpy(dtype=float)
+        segments[name] = [
+            (start, end, wpm[start:end].mean())
+            for start, end in detect_changepoints(wpm)
+        ]
+    return segments
+
+
+def build_learning_curve(df_sorted, column, title, segments):
+    # Create learning curves for each value of the column
+    fig_learning = go.Figure()
+
+    for i, name in enumerate(df_sorted[column].unique()):
+        group_data = df_sorted[df_sorted[column] == name].copy()
+        color = theme["chart_colors"][i % len(theme["chart_colors"])]
+
+        if len(group_data) > 1:  # Only show if there's more than one data point
+            # Add session number for this group
+            group_data["session_number"] = range(1, len(group_data) + 1)
+
+            # Calculate rolling average
+            window_size = min(3, len(group_data))
+            group_data["wpm_rolling"] = group_data["wpm"].rolling(
+                window=window_size, min_periods=1
+            ).mean()
+
+            fig_learning.add_trace(go.Scatter(
+                x=group_data["session_number"],
+                y=group_data["wpm_rolling"],
+                mode="lines+markers",
+                name=name,
+                legendgroup=name,
+                line=dict(color=color),
+                hovertemplate=f"<b>{name}</b><br>Session: %{{x}}<br>WPM: %{{y:.2f}}<extra></extra>"
+            ))
+
+            # Mark each detected segment with its mean WPM
+            if len(segments[name]) > 1:
+                x, y = [], []
+                for start, end, mean in segments[name]:
+                    x += [start + 1, end, None]
+                    y += [mean, mean, None]
+                fig_learning.add_trace(go.Scatter(
+                    x=x,
+                    y=y,
+                    mode="lines",
+                    name=f"{name} segments",
+                    legendgroup=name,
+                    showlegend=False,
+                    line=dict(color=color, dash="dash", width=3),
+                    hovertemplate=f"<b>{name}</b><br>Segment mean WPM: %{{y:.1f}}<extra></extra>"
+                ))
+
+    fig_learning.update_layout(
+        title=title,
+        xaxis_title="Session Number",
+        yaxis_title="Words Per Minute (WPM)",
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    return style_axes(fig_learning)
+
+
+def build_learning_curve_figures(df, aggregate):
+    df_sorted = df.sort_values("date")
+    figures = {}
+    for column, title in [
+        ("wordList", "Learning Curve by Word List"),
+        ("mode", "Learning Curve by Game Mode"),
+    ]:
+        segments = aggregate(
+            f"{column}_segments", lambda: learning_segments(df_sorted, column)
+        )
+        figures[column] = build_learning_curve(df_sorted, column, title, segments)
+    return figures
+
+
+# Trailing windows for the rolling personal best curves
+ROLLING_BEST_DAYS = 30
+ROLLING_BEST_SESSIONS = 10
+
+
+def sliding_max(values, window):
+    """Maximum of each trailing window of `window` values, in O(n)."""
+    values = list(values)
+    result = np.empty(len(values))
+    # Indices of window values in decreasing order of value
+    candidates = deque()
+    for i, value in enumerate(values):
+        while candidates and values[candidates[-1]] <= value:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        result[i] = values[candidates[0]]
+    return result
+
+
+def sliding_max_by_time(times, values, span):
+    """Maximum over the trailing time span ending at each session, in O(n)."""
+    times, values = list(times), list(values)
+    result = np.empty(len(values))
+    candidates = deque()
+    for i, value in enumerate(values):
+        while candidates and values[candidates[-1]] <= value:
+            candidates.pop()
+        candidates.append(i)
+        while times[candidates[0]] <= times[i] - span:
+            candidates.popleft()
+        result[i] = values[candidates[0]]
+    return result
+
+
+def practice_streaks(dates):
+    """Runs of consecutive practice days, one row per streak."""
+    days = np.unique(dates.to_numpy().astype("datetime64[D]"))
+    # A gap of more than one day starts a new streak
+    breaks = np.diff(days).astype(np.int64) != 1
+    starts = np.concatenate([[True], breaks])
+    lengths = np.bincount(np.cumsum(starts) - 1)
+    return pd.DataFrame({"start": days[starts], "days": lengths})
+
+
+def personal_bests(df):
+    """All-time and rolling best WPM after each session, per mode and word list."""
+    frames = []
+    for (mode, word_list), group in df.sort_values("date").groupby(["mode", "wordList"]):
+        times = group["date"].to_numpy()
+        wpm = group["wpm"].to_numpy(dtype=float)
+        frames.append(pd.DataFrame({
+            "date": times,
+            "combo": f"{mode} - {word_list}",
+            "all_time": np.maximum.accumulate(wpm),
+            "last_days": sliding_max_by_time(
+                times, wpm, np.timedelta64(ROLLING_BEST_DAYS, "D")
+            ),
+            "last_sessions": sliding_max(wpm, ROLLING_BEST_SESSIONS),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_personal_best_figures(df, aggregate):
+    bests = aggregate("personal_bests", lambda: personal_bests(df))
+    figures = {}
+    for column, title in [
+        ("all_time", "All-Time Best WPM by Mode & Word List"),
+        ("last_days", f"Best WPM in the Last {ROLLING_BEST_DAYS} Days"),
+        ("last_sessions", f"Best WPM in the Last {ROLLING_BEST_SESSIONS} Sessions"),
+    ]:
+        fig_bests = go.Figure()
+
+        for i, (combo, combo_data) in enumerate(bests.groupby("combo", sort=False)):
+            fig_bests.add_trace(go.Scatter(
+                x=combo_data["date"],
+                y=combo_data[column],
+                mode="lines",
+                name=combo,
+                line=dict(
+                    color=theme["chart_colors"][i % len(theme["chart_colors"])],
+                    shape="hv"
+                ),
+                hovertemplate=f"<b>{combo}</b><br>%{{x}}<br>Best WPM: %{{y:.0f}}<extra></extra>"
+            ))
+
+        fig_bests.update_layout(
+            title=title,
+            xaxis_title="Date",
+            yaxis_title="Words Per Minute (WPM)",
+            height=400,
+            paper_bgcolor=theme["background"],
+            plot_bgcolor=theme["background"],
+            font=dict(color=theme["text"]),
+        )
+        figures[column] = style_axes(fig_bests)
+
+    figures["streaks"] = aggregate("practice_streaks", lambda: practice_streaks(df["date"]))
+    return figures
+
+
+def build_score_figures(df, aggregate):
+    # Filter out entries without scores (like Zen Mode)
+    df_with_scores = df[df["score"].notna() & (df["score"] > 0)].copy()
+
+    if df_with_scores.empty:
+        return None
+
+    # Score Efficiency Analysis (Score per WPM)
+    df_with_scores["score_per_wpm"] = df_with_scores["score"] / df_with_scores["wpm"]
+
+    fig_efficiency = px.scatter(
+        df_with_scores,
+        x="wpm",
+        y="score_per_wpm",
+        color="accuracy",
+        title="Score Efficiency Analysis (Score per WPM)",
+        labels={
+            "wpm": "Words Per Minute",
+            "score_per_wpm": "Score per WPM",
+            "accuracy": "Accuracy (%)"
+        },
+        color_continuous_scale="Viridis"
+    )
+
+    fig_efficiency.update_layout(
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    style_axes(fig_efficiency)
+
+    # Score vs WPM scatter plot
+    fig_score_wpm = px.scatter(
+        df_with_scores,
+        x="wpm",
+        y="score",
+        color="mode",
+        title="Score vs WPM Relationship",
+        labels={
+            "wpm": "Words Per Minute",
+            "score": "Score",
+            "mode": "Game Mode"
+        },
+        color_discrete_sequence=theme["chart_colors"]
+    )
+
+    fig_score_wpm.update_layout(
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    style_axes(fig_score_wpm)
+
+    # High score progression over time, with a personal best per mode and
+    # word list since scores are not comparable across them
+    df_scores_sorted = df_with_scores.sort_values("date")
+    df_scores_sorted["session_number"] = range(1, len(df_scores_sorted) + 1)
+    df_scores_sorted["personal_best"] = df_scores_sorted.groupby(
+        ["mode", "wordList"]
+    )["score"].cummax()
+
+    fig_score_progression = go.Figure()
+
+    for i, ((mode, word_list), combo_data) in enumerate(
+        df_scores_sorted.groupby(["mode", "wordList"])
+    ):
+        combo = f"{mode} - {word_list}"
+        color = theme["chart_colors"][i % len(theme["chart_colors"])]
+
+        # Add individual scores
+        fig_score_progression.add_trace(go.Scatter(
+            x=combo_data["session_number"],
+            y=combo_data["score"],
+            mode="markers",
+            name=combo,
+            legendgroup=combo,
+            marker=dict(
+                color=color,
+                size=6,
+                opacity=0.6
+            ),
+            hovertemplate=f"<b>{combo}</b><br>Session %{{x}}<br>Score: %{{y:.0f}}<extra></extra>"
+        ))
+
+        # Add personal best progression line
+        fig_score_progression.add_trace(go.Scatter(
+            x=combo_data["session_number"],
+            y=combo_data["personal_best"],
+            mode="lines",
+            name=f"{combo} Personal Best",
+            legendgroup=combo,
+            showlegend=False,
+            line=dict(
+                color=color,
+                width=3,
+                shape="hv"
+            ),
+            hovertemplate=f"<b>{combo}</b><br>Session %{{x}}<br>Personal Best: %{{y:.0f}}<extra></extra>"
+        ))
+
+    fig_score_progression.update_layout(
+        title="Score Progression Over Time",
+        xaxis_title="Session Number",
+        yaxis_title="Score",
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    style_axes(fig_score_progression)
+
+    return {
+        "efficiency": fig_efficiency,
+        "score_wpm": fig_score_wpm,
+        "progression": fig_score_progression,
+    }
+
+
+def build_consistency_figure(df, aggregate):
+    def combo_stats():
+        stats = df.groupby(["mode", "wordList"]).agg({
+            "wpm": ["mean", "std", "count"],
+            "accuracy": ["mean", "std"]
+        }).reset_index()
+        # Flatten column names
+        stats.columns = ["mode", "wordList", "wpm_mean", "wpm_std", "session_count", "accuracy_mean", "accuracy_std"]
+        return stats
+
+    # Calculate consistency metrics
+    consistency_stats = aggregate("combo_stats", combo_stats)
+
+    # Filter out combinations with less than 3 sessions
+    consistency_stats = consistency_stats[consistency_stats["session_count"] >= 3].copy()
+
+    if consistency_stats.empty:
+        return None
+
+    # Calculate consistency score (lower std = higher consistency)
+    consistency_stats["consistency_score"] = 100 / (1 + consistency_stats["wpm_std"])
+    consistency_stats["combo"] = consistency_stats["mode"] + " - " + consistency_stats["wordList"]
+
+    # Sort by consistency score
+    consistency_stats = consistency_stats.sort_values("consistency_score", ascending=False)
+
+    # Create consistency chart
+    fig_consistency = go.Figure()
+
+    # Add consistency bars
+    fig_consistency.add_trace(go.Bar(
+        name="Consistency Score",
+        x=consistency_stats["combo"],
+        y=consistency_stats["consistency_score"].round(2),
+        marker_color=theme["primary"],
+        customdata=np.column_stack([consistency_stats["session_count"], consistency_stats["wpm_std"]]),
+        hovertemplate="<b>%{x}</b><br>Consistency: %{y:.2f}<br>Sessions: %{customdata[0]:.0f}<br>WPM Std: %{customdata[1]:.2f}<extra></extra>"
+    ))
+
+    fig_consistency.update_layout(
+        title="Performance Consistency by Mode & Word List (Higher = More Consistent)",
+        xaxis_title="Game Mode - Word List",
+        yaxis_title="Consistency Score",
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+        xaxis=dict(tickangle=45)
+    )
+    return style_axes(fig_consistency)
+
+
+def build_category_figure(df, aggregate, column, label, title):
+    performance = aggregate(
+        f"{column}_performance",
+        lambda: df.groupby(column)[["wpm", "accuracy"]].mean().reset_index(),
+    )
+    # Sort by average WPM
+    performance = performance.sort_values("wpm", ascending=False)
+    # Create the bar chart
+    fig_category = px.bar(
+        performance,
+        x=column,
+        y="wpm",
+        color="accuracy",
+        title=title,
+        color_continuous_scale="Viridis",
+        labels={
+            "wpm": "Words Per Minute",
+            column: label,
+            "accuracy": "Accuracy (%)",
+        },
+    )
+    fig_category.update_layout(
+        xaxis_title=label,
+        yaxis_title="Words Per Minute (WPM)",
+        coloraxis_colorbar_title="Accuracy (%)",
+        height=400,
+        paper_bgcolor=theme["background"],
+        plot_bgcolor=theme["background"],
+        font=dict(color=theme["text"]),
+    )
+    return style_axes(fig_category)
+
+
+def build_category_figures(df, aggregate):
+    return {
+        "mode": build_category_figure(
+            df, aggregate, "mode", "Game Mode", "Average WPM by Game Mode"
+        ),
+        "wordList": build_category_figure(
+            df, aggregate, "wordList", "Word List", "Average WPM by Word List"
+        ),
+    }
+
+
+# Renderers run on the script thread once their section's figures are ready
+def select_sessions(chart_key, column):
+    """Focus the session explorer on the point clicked in a chart."""
+    points = st.session_state[chart_key]["selection"]["points"]
+    if points:
+        st.session_state["explorer_focus"] = (column, points[0]["x"])
+        st.session_state["explorer_page"] = 1
+
+
+def clickable_chart(fig, key, column):
+    # Clicking a point shows the sessions behind it in the session explorer
+    st.plotly_chart(
+        fig,
+        use_container_width=True,
+        key=key,
+        on_select=partial(select_sessions, key, column),
+        selection_mode="points",
+    )
+
+
+def render_trends(figures):
+    # Create tabs for different performance metrics
+    tab1, tab2, tab3 = st.tabs(
+        ["WPM Over Time", "Accuracy Over Time", "Score Over Time"]
+    )
+    with tab1:
+        clickable_chart(figures["wpm"], "wpm_trend_chart", "day")
+    with tab2:
+        clickable_chart(figures["accuracy"], "accuracy_trend_chart", "day")
+    with tab3:
+        if figures["score"] is not None:
+            clickable_chart(figures["score"], "score_trend_chart", "day")
+        else:
+            st.info(
+                "Score data is not available for the selected filters or game modes."
+            )
+
+
+def render_practice_heatmaps(figures):
+    tab1, tab2, tab3 = st.tabs(["Sessions", "Average WPM", "Average Accuracy"])
+    with tab1:
+        st.plotly_chart(figures["count"], use_container_width=True)
+    with tab2:
+        st.plotly_chart(figures["wpm"], use_container_width=True)
+    with tab3:
+        st.plotly_chart(figures["accuracy"], use_container_width=True)
+
+
+def render_scatter(fig_scatter):
+    st.plotly_chart(fig_scatter, use_container_width=True)
+
+
+def render_learning_curves(figures):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures["wordList"], use_container_width=True)
+    with col2:
+        st.plotly_chart(figures["mode"], use_container_width=True)
+
+
+def render_personal_bests(figures):
+    streaks = figures["streaks"]
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        longest = streaks["days"].max()
+        st.metric("Longest Streak", f"{longest} day{'s' if longest != 1 else ''}")
+
+    with col2:
+        # The latest streak is over once a day without practice has passed
+        last = streaks.iloc[-1]
+        last_day = last["start"] + pd.Timedelta(days=int(last["days"]) - 1)
+        yesterday = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+        latest = int(last["days"]) if last_day >= yesterday else 0
+        st.metric("Latest Streak", f"{latest} day{'s' if latest != 1 else ''}")
+
+    with col3:
+        st.metric("Practice Days", int(streaks["days"].sum()))
+
+    tab1, tab2, tab3 = st.tabs([
+        "All-Time Best",
+        f"Best in Last {ROLLING_BEST_DAYS} Days",
+        f"Best in Last {ROLLING_BEST_SESSIONS} Sessions",
+    ])
+    with tab1:
+        st.plotly_chart(figures["all_time"], use_container_width=True)
+    with tab2:
+        st.plotly_chart(figures["last_days"], use_container_width=True)
+    with tab3:
+        st.plotly_chart(figures["last_sessions"], use_container_width=True)
+
+
+def render_score_analysis(figures):
+    if figures is None:
+        st.info("No score data available to display. Score analysis requires non-Zen Mode sessions.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures["efficiency"], use_container_width=True)
+    with col2:
+        st.plotly_chart(figures["score_wpm"], use_container_width=True)
+    st.plotly_chart(figures["progression"], use_container_width=True)
+
+
+def render_consistency(fig_consistency):
+    if fig_consistency is None:
+        st.info("Not enough data for consistency analysis (need at least 3 sessions per mode-wordlist combination)")
+        return
+    clickable_chart(fig_consistency, "consistency_chart", "combo")
+
+
+def render_categories(figures):
+    col1, col2 = st.columns(2)
+    with col1:
+        clickable_chart(figures["mode"], "mode_chart", "mode")
+    with col2:
+        clickable_chart(figures["wordList"], "word_list_chart", "wordList")
+
+
+# Dashboard sections in page order: (header, description, builder, renderer)
+SECTIONS = [
+    ("Performance Trends", None, build_trend_figures, render_trends),
+    (
+        "Practice Patterns",
+        "When you practice and how well you type at each time of the week. Empty cells are hours with no sessions.",
+        build_practice_heatmaps,
+        render_practice_heatmaps,
+    ),
+    (
+        "WPM vs Accuracy Analysis",
+        "Shows the relationship between your typing speed and accuracy across different game modes. Look for your optimal balance point where high speed meets high accuracy.",
+        build_scatter_figure,
+        render_scatter,
+    ),
+    (
+        "Learning Curves Analysis",
+        "Track your improvement over time across different word lists and game modes. Rolling averages smooth out session-to-session variation, and dashed lines mark stretches where your average speed held steady before a plateau or jump.",
+        build_learning_curve_figures,
+        render_learning_curves,
+    ),
+    (
+        "Score Analysis",
+        "Comprehensive scoring insights including efficiency analysis and personal best progression. Score efficiency reveals the optimal balance of speed vs accuracy for maximum points.",
+        build_score_figures,
+        render_score_analysis,
+    ),
+    (
+        "Personal Bests & Streaks",
+        "Your best WPM for each game mode and word list, all-time and over recent days and sessions, along with your runs of consecutive practice days.",
+        build_personal_best_figures,
+        render_personal_bests,
+    ),
+    (
+        "Performance Consistency Analysis",
+        "Measures how consistent your performance is across different game mode and word list combinations. Higher consistency scores indicate more predictable and stable typing performance.",
+        build_consistency_figure,
+        render_consistency,
+    ),
+    ("Performance by Category", None, build_category_figures, render_categories),
+]
+
+
+# Section builds mostly wait on the GIL and the shared cache rather than
+# using a core each, so the pool is sized to run two sessions' sections at
+# once instead of by CPU count
+SECTION_WORKERS = int(os.environ.get("NERDTYPE_SECTION_WORKERS", len(SECTIONS) * 2))
+
+
+@st.cache_resource
+def get_section_executor():
+    # One pool per process, shared by every session
+    return ThreadPoolExecutor(
+        max_workers=SECTION_WORKERS, thread_name_prefix="nerdtype-section"
+    )
 
 
 # Main app layoutcol1, col2, col3 = st.columns([1, 1, 1])
@@ -205,7 +1705,7 @@ with col2:
     )
 if uploaded_file is not None:
     # Load the data
-    df = load_data(uploaded_file)
+    df, sketches = load_data(uploaded_file)
 
     if not df.empty:
         # Overall Performance Metrics
@@ -225,7 +1725,7 @@ if uploaded_file is not None:
         with col3:
             # Only show average score if not all entries are Zen Mode
             non_zen = df[df["mode"] != "Zen Mode"]
-            if not non_zen.empty and "score" in df.columns:
+            if non_zen["score"].notna().any():
                 st.metric("Average Score", f"{non_zen['score'].mean():.0f}")
             else:
                 st.metric("Total Sessions", len(df))
@@ -236,654 +1736,287 @@ if uploaded_file is not None:
         with col5:
             st.metric("Total Games", len(df))
 
-        # Performance Trends with Tabs
-        st.markdown(
-            '<div class="sub-header">Performance Trends</div>', unsafe_allow_html=True
-        )
-
-        # Create tabs for different performance metrics
-        tab1, tab2, tab3 = st.tabs(
-            ["WPM Over Time", "Accuracy Over Time", "Score Over Time"]
-        )
-
-        # Ensure the data is sorted by date
-        df_time = df.sort_values("date")
-
-        with tab1:
-            # Group by day and calculate mean WPM
-            daily_wpm = df_time.groupby("day")["wpm"].mean().reset_index()
-            daily_wpm["day"] = pd.to_datetime(daily_wpm["day"])
-
-            # Create the Plotly line chart for WPM using theme colors
-            fig_wpm = px.line(
-                daily_wpm,
-                x="day",
-                y="wpm",
-                title="Average WPM by Day",
-                labels={"day": "Date", "wpm": "Words Per Minute"},
-                line_shape="linear",
-                color_discrete_sequence=[theme["primary"]],
-            )
-
-            # Add markers and improve layout
-            fig_wpm.update_traces(mode="lines+markers", marker=dict(size=8))
-            fig_wpm.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Words Per Minute (WPM)",
-                hovermode="x unified",
-                height=500,
-                paper_bgcolor=theme["background"],
-                plot_bgcolor=theme["background"],
-                font=dict(color=theme["text"]),
-            )
-
-            # Update grid and axes colors
-            fig_wpm.update_xaxes(
-                gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
-            )
-            fig_wpm.update_yaxes(
-                gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
-            )
-
-            # Add a simple moving average line
-            window_size = min(5, len(daily_wpm))
-            if window_size > 1:
-                daily_wpm["wpm_ma"] = (
-                    daily_wpm["wpm"].rolling(window=window_size, min_periods=1).mean()
-                )
-                fig_wpm.add_trace(
-                    go.Scatter(
-                        x=daily_wpm["day"],
-                        y=daily_wpm["wpm_ma"],
-                        mode="lines",
-                        line=dict(color=theme["accent"], dash="dash", width=2),
-                        name=f"{window_size}-Day Moving Average",
-                    )
-                )
+        # Percentiles come straight from the sketches built during ingestion
+        wpm_percentiles = sketches.overall("wpm")
+        accuracy_percentiles = sketches.overall("accuracy")
+        col1, col2, col3, col4, col5 = st.columns(5)
 
-            st.plotly_chart(fig_wpm, use_container_width=True)
-
-        with tab2:
-            # Group by day and calculate mean accuracy
-            daily_accuracy = df_time.groupby("day")["accuracy"].mean().reset_index()
-            daily_accuracy["day"] = pd.to_datetime(daily_accuracy["day"])
-
-            # Create the Plotly line chart for Accuracy
-            fig_accuracy = px.line(
-                daily_accuracy,
-                x="day",
-                y="accuracy",
-                title="Average Accuracy by Day",
-                labels={"day": "Date", "accuracy": "Accuracy (%)"},
-                line_shape="linear",
-                color_discrete_sequence=[theme["primary"]],
-            )
+        with col1:
+            st.metric("Median WPM", f"{wpm_percentiles[0.5]:.0f}")
 
-            # Add markers and improve layout
-            fig_accuracy.update_traces(mode="lines+markers", marker=dict(size=8))
-            fig_accuracy.update_layout(
-                xaxis_title="Date",
-                yaxis_title="Accuracy (%)",
-                hovermode="x unified",
-                height=500,
-                paper_bgcolor=theme["background"],
-                plot_bgcolor=theme["background"],
-                font=dict(color=theme["text"]),
-            )
+        with col2:
+            st.metric("P90 WPM", f"{wpm_percentiles[0.9]:.0f}")
 
-            # Update grid and axes colors
-            fig_accuracy.update_xaxes(
-                gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
-            )
-            fig_accuracy.update_yaxes(
-                gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
-            )
+        with col3:
+            st.metric("P99 WPM", f"{wpm_percentiles[0.99]:.0f}")
 
-            # Add a trend line
-            trend = px.scatter(
-                daily_accuracy,
-                x="day",
-                y="accuracy",
-                trendline="ols",
-                color_discrete_sequence=[theme["accent"]],
-            ).data[1]
-            trend.update(
-                hovertemplate="Trend: %{y:.1f}%<extra></extra>", name="Trend Line"
-            )
-            fig_accuracy.add_trace(trend)
-
-            st.plotly_chart(fig_accuracy, use_container_width=True)
-
-        with tab3:
-            # Filter out Zen Mode data (which doesn't have scores)
-            df_with_score = df_time[df_time["mode"] != "Zen Mode"].copy()
-
-            if not df_with_score.empty and "score" in df_with_score.columns:
-                # Group by day and calculate mean score
-                daily_score = df_with_score.groupby("day")["score"].mean().reset_index()
-                daily_score["day"] = pd.to_datetime(daily_score["day"])
-
-                # Create the Plotly line chart for Score
-                fig_score = px.line(
-                    daily_score,
-                    x="day",
-                    y="score",
-                    title="Average Score by Day",
-                    labels={"day": "Date", "score": "Score"},
-                    line_shape="linear",
-                    color_discrete_sequence=[theme["primary"]],
-                )
+        with col4:
+            st.metric("Median Accuracy", f"{accuracy_percentiles[0.5]:.1f}%")
 
-                # Add markers and improve layout
-                fig_score.update_traces(mode="lines+markers", marker=dict(size=8))
-                fig_score.update_layout(
-                    xaxis_title="Date",
-                    yaxis_title="Score",
-                    hovermode="x unified",
-                    height=500,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
+        with col5:
+            st.metric("P90 Accuracy", f"{accuracy_percentiles[0.9]:.1f}%")
 
-                # Update grid and axes colors
-                fig_score.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                fig_score.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
+        # Compute every section in the background as soon as the data is in
+        executor = get_section_executor()
+        aggregate = dataset_aggregator()
+        futures = [
+            executor.submit(build_section, build, df, aggregate)
+            for _, _, build, _ in SECTIONS
+        ]
 
-                # Add a trend line
-                trend = px.scatter(
-                    daily_score,
-                    x="day",
-                    y="score",
-                    trendline="ols",
-                    color_discrete_sequence=[theme["accent"]],
-                ).data[1]
-                trend.update(
-                    hovertemplate="Trend: %{y:.0f}<extra></extra>", name="Trend Line"
+        try:
+            # Lay out the page, leaving a placeholder for each section's charts
+            pending = {}
+            for future, (header, description, _, render) in zip(futures, SECTIONS):
+                st.markdown(
+                    f'<div class="sub-header">{header}</div>', unsafe_allow_html=True
                 )
-                fig_score.add_trace(trend)
+                if description:
+                    st.markdown(
+                        f'<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">{description}</p>',
+                        unsafe_allow_html=True
+                    )
+                pending[future] = (st.empty(), render)
 
-                st.plotly_chart(fig_score, use_container_width=True)
-            else:
-                st.info(
-                    "Score data is not available for the selected filters or game modes."
-                )
+            # Render each section as soon as its figures are ready
+            for future in as_completed(pending):
+                placeholder, render = pending[future]
+                with placeholder.container():
+                    render(future.result())
+        finally:
+            # Free the pool of builds a stopped or failed run no longer needs
+            for future in futures:
+                future.cancel()
 
-                # WPM vs Accuracy Scatter Plot
+        # Performance Percentiles
         st.markdown(
-            '<div class="sub-header">WPM vs Accuracy Analysis</div>', unsafe_allow_html=True
+            '<div class="sub-header">Performance Percentiles</div>',
+            unsafe_allow_html=True,
         )
         st.markdown(
-            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Shows the relationship between your typing speed and accuracy across different game modes. Look for your optimal balance point where high speed meets high accuracy.</p>',
+            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Median, 90th and 99th percentile WPM and accuracy for each game mode, word list and user. Percentiles show your typical and best sessions where averages blur them together.</p>',
             unsafe_allow_html=True
         )
-        
-        # Create scatter plot - simplified version to avoid validation errors
-        fig_scatter = px.scatter(
-            df,
-            x="accuracy",
-            y="wpm",
-            color="mode",
-            title="WPM vs Accuracy by Game Mode",
-            labels={
-                "accuracy": "Accuracy (%)",
-                "wpm": "Words Per Minute",
-                "mode": "Game Mode"
-            },
-            color_discrete_sequence=theme["chart_colors"]
-        )
-        
-        fig_scatter.update_layout(
-            xaxis_title="Accuracy (%)",
-            yaxis_title="Words Per Minute (WPM)",
-            height=500,
-            paper_bgcolor=theme["background"],
-            plot_bgcolor=theme["background"],
-            font=dict(color=theme["text"]),
-        )
-        
-        # Update grid and axes colors
-        fig_scatter.update_xaxes(
-            gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
-        )
-        fig_scatter.update_yaxes(
-            gridcolor="rgba(128,128,128,0.1)", zerolinecolor="rgba(128,128,128,0.2)"
+
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            dimension = st.radio(
+                "Group by",
+                [d for d in SKETCH_DIMENSIONS if d in sketches.groups],
+                format_func=SKETCH_DIMENSIONS.get,
+                horizontal=True,
+            )
+        with col2:
+            months = [str(month) for month in sketches.months]
+            if len(months) > 1:
+                start, end = st.select_slider(
+                    "Months", options=months, value=(months[0], months[-1])
+                )
+            else:
+                start, end = months[0], months[0]
+
+        st.dataframe(
+            sketches.summary(dimension, start, end),
+            hide_index=True,
+            use_container_width=True,
         )
-        
-        st.plotly_chart(fig_scatter, use_container_width=True)
+        if sketches.clipped["wpm"]:
+            st.caption(
+                f"{sketches.clipped['wpm']} session(s) above "
+                f"{SKETCH_BINS['wpm'][1]:.0f} WPM are counted as "
+                f"{SKETCH_BINS['wpm'][1]:.0f} WPM in these percentiles."
+            )
 
-        # Learning Curves Analysis - 2 columns layout
+        # Period Comparison
         st.markdown(
-            '<div class="sub-header">Learning Curves Analysis</div>',
+            '<div class="sub-header">Period Comparison</div>',
             unsafe_allow_html=True,
         )
         st.markdown(
-            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Track your improvement over time across different word lists and game modes. Rolling averages smooth out session-to-session variation to show clear progress trends.</p>',
+            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Compare two date ranges for each game mode and word list combination. By default your latest month of practice is compared with the month before it.</p>',
             unsafe_allow_html=True
         )
 
-        col1, col2 = st.columns(2)
+        period_table = aggregate("period_table", lambda: PeriodTable.from_frame(df))
+        last_day = df["date"].max().date()
+        month_start = last_day.replace(day=1)
+        previous_end = month_start - pd.Timedelta(days=1)
 
+        col1, col2 = st.columns(2)
         with col1:
-            # Learning Curve by Word List
-            if "wordList" in df.columns:
-                # Create learning curves for each word list
-                fig_learning_wordlist = go.Figure()
-                
-                df_sorted = df.sort_values("date")
-                
-                for i, word_list in enumerate(df["wordList"].unique()):
-                    wordlist_data = df_sorted[df_sorted["wordList"] == word_list].copy()
-                    
-                    if len(wordlist_data) > 1:  # Only show if there's more than one data point
-                        # Add session number for this word list
-                        wordlist_data["session_number"] = range(1, len(wordlist_data) + 1)
-                        
-                        # Calculate rolling average
-                        window_size = min(3, len(wordlist_data))
-                        wordlist_data["wpm_rolling"] = wordlist_data["wpm"].rolling(
-                            window=window_size, min_periods=1
-                        ).mean()
-                        
-                        fig_learning_wordlist.add_trace(go.Scatter(
-                            x=wordlist_data["session_number"],
-                            y=wordlist_data["wpm_rolling"],
-                            mode="lines+markers",
-                            name=word_list,
-                            line=dict(color=theme["chart_colors"][i % len(theme["chart_colors"])]),
-                            hovertemplate=f"<b>{word_list}</b><br>Session: %{{x}}<br>WPM: %{{y:.2f}}<extra></extra>"
-                        ))
-                
-                fig_learning_wordlist.update_layout(
-                    title="Learning Curve by Word List",
-                    xaxis_title="Session Number",
-                    yaxis_title="Words Per Minute (WPM)",
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
-                
-                fig_learning_wordlist.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                fig_learning_wordlist.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                
-                st.plotly_chart(fig_learning_wordlist, use_container_width=True)
-
+            current = st.date_input(
+                "Current period", value=(month_start, last_day), key="current_period"
+            )
         with col2:
-            # Learning Curve by Game Mode
-            if "mode" in df.columns:
-                # Create learning curves for each game mode
-                fig_learning_mode = go.Figure()
-                
-                df_sorted = df.sort_values("date")
-                
-                for i, mode in enumerate(df["mode"].unique()):
-                    mode_data = df_sorted[df_sorted["mode"] == mode].copy()
-                    
-                    if len(mode_data) > 1:  # Only show if there's more than one data point
-                        # Add session number for this mode
-                        mode_data["session_number"] = range(1, len(mode_data) + 1)
-                        
-                        # Calculate rolling average
-                        window_size = min(3, len(mode_data))
-                        mode_data["wpm_rolling"] = mode_data["wpm"].rolling(
-                            window=window_size, min_periods=1
-                        ).mean()
-                        
-                        fig_learning_mode.add_trace(go.Scatter(
-                            x=mode_data["session_number"],
-                            y=mode_data["wpm_rolling"],
-                            mode="lines+markers",
-                            name=mode,
-                            line=dict(color=theme["chart_colors"][i % len(theme["chart_colors"])]),
-                            hovertemplate=f"<b>{mode}</b><br>Session: %{{x}}<br>WPM: %{{y:.2f}}<extra></extra>"
-                        ))
-                
-                fig_learning_mode.update_layout(
-                    title="Learning Curve by Game Mode",
-                    xaxis_title="Session Number",
-                    yaxis_title="Words Per Minute (WPM)",
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
-                
-                fig_learning_mode.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                fig_learning_mode.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                
-                st.plotly_chart(fig_learning_mode, use_container_width=True)
+            previous = st.date_input(
+                "Previous period",
+                value=(previous_end.replace(day=1), previous_end),
+                key="previous_period",
+            )
+
+        if len(current) == 2 and len(previous) == 2:
+            now = period_table.overall_stats(*current)
+            before = period_table.overall_stats(*previous)
+            # Averages and their changes only exist when both periods have sessions
+            comparable = now["sessions"] and before["sessions"]
+            col1, col2, col3 = st.columns(3)
 
-        # Score Analysis
-        st.markdown(
-            '<div class="sub-header">Score Analysis</div>',
-            unsafe_allow_html=True,
-        )
-        st.markdown(
-            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Comprehensive scoring insights including efficiency analysis and personal best progression. Score efficiency reveals the optimal balance of speed vs accuracy for maximum points.</p>',
-            unsafe_allow_html=True
-        )
-        
-        # Filter out entries without scores (like Zen Mode)
-        df_with_scores = df[df["score"].notna() & (df["score"] > 0)].copy()
-        
-        if not df_with_scores.empty:
-            col1, col2 = st.columns(2)
-            
             with col1:
-                # Score Efficiency Analysis (Score per WPM)
-                df_with_scores["score_per_wpm"] = df_with_scores["score"] / df_with_scores["wpm"]
-                
-                fig_efficiency = px.scatter(
-                    df_with_scores,
-                    x="wpm",
-                    y="score_per_wpm",
-                    color="accuracy",
-                    title="Score Efficiency Analysis (Score per WPM)",
-                    labels={
-                        "wpm": "Words Per Minute",
-                        "score_per_wpm": "Score per WPM",
-                        "accuracy": "Accuracy (%)"
-                    },
-                    color_continuous_scale="Viridis"
-                )
-                
-                fig_efficiency.update_layout(
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
-                
-                fig_efficiency.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
+                st.metric(
+                    "Sessions",
+                    now["sessions"],
+                    delta=int(now["sessions"] - before["sessions"]),
                 )
-                fig_efficiency.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                
-                st.plotly_chart(fig_efficiency, use_container_width=True)
-            
+
             with col2:
-                # Score vs WPM scatter plot
-                fig_score_wpm = px.scatter(
-                    df_with_scores,
-                    x="wpm",
-                    y="score",
-                    color="mode",
-                    title="Score vs WPM Relationship",
-                    labels={
-                        "wpm": "Words Per Minute",
-                        "score": "Score",
-                        "mode": "Game Mode"
-                    },
-                    color_discrete_sequence=theme["chart_colors"]
+                st.metric(
+                    "Average WPM",
+                    f"{now['wpm_mean']:.1f}" if now["sessions"] else "N/A",
+                    delta=(
+                        f"{now['wpm_mean'] - before['wpm_mean']:+.1f}"
+                        if comparable else None
+                    ),
                 )
-                
-                fig_score_wpm.update_layout(
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
-                
-                fig_score_wpm.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                fig_score_wpm.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
+
+            with col3:
+                st.metric(
+                    "Average Accuracy",
+                    f"{now['accuracy_mean']:.1f}%" if now["sessions"] else "N/A",
+                    delta=(
+                        f"{now['accuracy_mean'] - before['accuracy_mean']:+.1f}%"
+                        if comparable else None
+                    ),
                 )
-                
-                st.plotly_chart(fig_score_wpm, use_container_width=True)
-            
-            # High score progression over time
-            df_scores_sorted = df_with_scores.sort_values("date")
-            df_scores_sorted["session_number"] = range(1, len(df_scores_sorted) + 1)
-            df_scores_sorted["personal_best"] = df_scores_sorted["score"].cummax()
-            
-            fig_score_progression = go.Figure()
-            
-            # Add individual scores
-            fig_score_progression.add_trace(go.Scatter(
-                x=df_scores_sorted["session_number"],
-                y=df_scores_sorted["score"],
-                mode="markers",
-                name="Session Scores",
-                marker=dict(
-                    color=theme["accent"],
-                    size=6,
-                    opacity=0.6
-                ),
-                hovertemplate="Session %{x}<br>Score: %{y:.0f}<extra></extra>"
-            ))
-            
-            # Add personal best progression line
-            fig_score_progression.add_trace(go.Scatter(
-                x=df_scores_sorted["session_number"],
-                y=df_scores_sorted["personal_best"],
-                mode="lines",
-                name="Personal Best Progression",
-                line=dict(
-                    color=theme["primary"],
-                    width=3
-                ),
-                hovertemplate="Session %{x}<br>Personal Best: %{y:.0f}<extra></extra>"
-            ))
-            
-            fig_score_progression.update_layout(
-                title="Score Progression Over Time",
-                xaxis_title="Session Number",
-                yaxis_title="Score",
-                height=400,
-                paper_bgcolor=theme["background"],
-                plot_bgcolor=theme["background"],
-                font=dict(color=theme["text"]),
-            )
-            
-            fig_score_progression.update_xaxes(
-                gridcolor="rgba(128,128,128,0.1)",
-                zerolinecolor="rgba(128,128,128,0.2)",
-            )
-            fig_score_progression.update_yaxes(
-                gridcolor="rgba(128,128,128,0.1)",
-                zerolinecolor="rgba(128,128,128,0.2)",
+
+            comparison = period_table.compare(current, previous)
+            st.dataframe(
+                comparison[[
+                    "mode", "wordList",
+                    "sessions", "wpm_mean", "accuracy_mean",
+                    "sessions_previous", "wpm_mean_previous", "accuracy_mean_previous",
+                    "wpm_change", "accuracy_change",
+                ]].round(2),
+                column_config={
+                    "mode": "Game Mode",
+                    "wordList": "Word List",
+                    "sessions": "Sessions",
+                    "wpm_mean": "WPM",
+                    "accuracy_mean": "Accuracy (%)",
+                    "sessions_previous": "Previous Sessions",
+                    "wpm_mean_previous": "Previous WPM",
+                    "accuracy_mean_previous": "Previous Accuracy (%)",
+                    "wpm_change": "WPM Change",
+                    "accuracy_change": "Accuracy Change",
+                },
+                hide_index=True,
+                use_container_width=True,
             )
-            
-            st.plotly_chart(fig_score_progression, use_container_width=True)
-            
         else:
-            st.info("No score data available to display. Score analysis requires non-Zen Mode sessions.")
+            st.info("Select a start and end date for both periods to compare them.")
 
-        # Performance Consistency Analysis
+        # Session Explorer
         st.markdown(
-            '<div class="sub-header">Performance Consistency Analysis</div>',
+            '<div class="sub-header">Session Explorer</div>',
             unsafe_allow_html=True,
         )
         st.markdown(
-            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Measures how consistent your performance is across different game mode and word list combinations. Higher consistency scores indicate more predictable and stable typing performance.</p>',
+            '<p style="color: #565f89; font-style: italic; margin-bottom: 1rem;">Browse your individual sessions. Click a day in the trend charts, or a bar in the consistency and category charts, to jump to the sessions behind it.</p>',
             unsafe_allow_html=True
         )
-        
-        # Calculate consistency metrics
-        consistency_stats = df.groupby(["mode", "wordList"]).agg({
-            "wpm": ["mean", "std", "count"],
-            "accuracy": ["mean", "std"]
-        }).reset_index()
-        
-        # Flatten column names
-        consistency_stats.columns = ["mode", "wordList", "wpm_mean", "wpm_std", "session_count", "accuracy_mean", "accuracy_std"]
-        
-        # Filter out combinations with less than 3 sessions
-        consistency_stats = consistency_stats[consistency_stats["session_count"] >= 3]
-        
-        if not consistency_stats.empty:
-            # Calculate consistency score (lower std = higher consistency)
-            consistency_stats["consistency_score"] = 100 / (1 + consistency_stats["wpm_std"])
-            consistency_stats["combo"] = consistency_stats["mode"] + " - " + consistency_stats["wordList"]
-            
-            # Sort by consistency score
-            consistency_stats = consistency_stats.sort_values("consistency_score", ascending=False)
-            
-            # Create consistency chart
-            fig_consistency = go.Figure()
-            
-            # Add consistency bars
-            fig_consistency.add_trace(go.Bar(
-                name="Consistency Score",
-                x=consistency_stats["combo"],
-                y=consistency_stats["consistency_score"].round(2),
-                marker_color=theme["primary"],
-                hovertemplate="<b>%{x}</b><br>Consistency: %{y:.2f}<br>Sessions: " + consistency_stats["session_count"].astype(str) + "<br>WPM Std: " + consistency_stats["wpm_std"].round(2).astype(str) + "<extra></extra>"
-            ))
-            
-            fig_consistency.update_layout(
-                title="Performance Consistency by Mode & Word List (Higher = More Consistent)",
-                xaxis_title="Game Mode - Word List",
-                yaxis_title="Consistency Score",
-                height=400,
-                paper_bgcolor=theme["background"],
-                plot_bgcolor=theme["background"],
-                font=dict(color=theme["text"]),
-                xaxis=dict(tickangle=45)
-            )
-            
-            fig_consistency.update_xaxes(
-                gridcolor="rgba(128,128,128,0.1)",
-                zerolinecolor="rgba(128,128,128,0.2)",
-            )
-            fig_consistency.update_yaxes(
-                gridcolor="rgba(128,128,128,0.1)",
-                zerolinecolor="rgba(128,128,128,0.2)",
-            )
-            
-            st.plotly_chart(fig_consistency, use_container_width=True)
-        else:
-            st.info("Not enough data for consistency analysis (need at least 3 sessions per mode-wordlist combination)")
-
-        # Performance by Category - 2 columns layout
-        st.markdown(
-            '<div class="sub-header">Performance by Category</div>',
-            unsafe_allow_html=True,
-        )
 
-        col1, col2 = st.columns(2)
+        session_index = aggregate("session_index", lambda: SessionIndex(df))
+        focus = st.session_state.get("explorer_focus")
+        day, modes, word_lists = None, [], []
+        if focus is not None:
+            column, value = focus
+            if column == "day":
+                day = pd.Timestamp(value).date()
+            elif column == "combo" and value in session_index.combos:
+                mode, word_list = session_index.combos[value]
+                modes, word_lists = [mode], [word_list]
+            elif column == "mode":
+                modes = [value]
+            elif column == "wordList":
+                word_lists = [value]
 
-        with col1:
-            # Performance by mode
-            if "mode" in df.columns:
-                mode_performance = (
-                    df.groupby("mode")[["wpm", "accuracy"]].mean().reset_index()
-                )
-                # Sort by average WPM
-                mode_performance = mode_performance.sort_values("wpm", ascending=False)
-                # Create the bar chart
-                fig_mode = px.bar(
-                    mode_performance,
-                    x="mode",
-                    y="wpm",
-                    color="accuracy",
-                    title="Average WPM by Game Mode",
-                    color_continuous_scale="Viridis",
-                    labels={
-                        "wpm": "Words Per Minute",
-                        "mode": "Game Mode",
-                        "accuracy": "Accuracy (%)",
-                    },
-                )
-                fig_mode.update_layout(
-                    xaxis_title="Game Mode",
-                    yaxis_title="Words Per Minute (WPM)",
-                    coloraxis_colorbar_title="Accuracy (%)",
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
-
-                # Update grid and axes colors
-                fig_mode.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
-                )
-                fig_mode.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.markdown(f"Showing sessions for **{day or value}**")
+            with col2:
+                st.button(
+                    "Clear selection",
+                    on_click=lambda: st.session_state.pop("explorer_focus", None),
                 )
 
-                st.plotly_chart(fig_mode, use_container_width=True)
-
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            sort_label = st.selectbox("Sort by", list(SessionIndex.SORT_COLUMNS))
         with col2:
-            # Performance by word list
-            if "wordList" in df.columns:
-                wordlist_performance = (
-                    df.groupby("wordList")[["wpm", "accuracy"]].mean().reset_index()
-                )
-                # Sort by average WPM
-                wordlist_performance = wordlist_performance.sort_values(
-                    "wpm", ascending=False
-                )
-                # Create the bar chart
-                fig_wordlist = px.bar(
-                    wordlist_performance,
-                    x="wordList",
-                    y="wpm",
-                    color="accuracy",
-                    title="Average WPM by Word List",
-                    color_continuous_scale="Viridis",
-                    labels={
-                        "wpm": "Words Per Minute",
-                        "wordList": "Word List",
-                        "accuracy": "Accuracy (%)",
-                    },
-                )
-                fig_wordlist.update_layout(
-                    xaxis_title="Word List",
-                    yaxis_title="Words Per Minute (WPM)",
-                    coloraxis_colorbar_title="Accuracy (%)",
-                    height=400,
-                    paper_bgcolor=theme["background"],
-                    plot_bgcolor=theme["background"],
-                    font=dict(color=theme["text"]),
-                )
+            descending = st.toggle("Descending", value=True)
+        with col3:
+            mode_filter = st.multiselect("Game Mode", list(session_index.labels["mode"]))
+        with col4:
+            word_list_filter = st.multiselect("Word List", list(session_index.labels["wordList"]))
 
-                # Update grid and axes colors
-                fig_wordlist.update_xaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
+        rows = session_index.query(
+            SessionIndex.SORT_COLUMNS[sort_label],
+            descending,
+            # A chart selection narrows the filters rather than replacing them
+            modes=combine_filters(modes, mode_filter),
+            word_lists=combine_filters(word_lists, word_list_filter),
+            day=day,
+        )
+
+        if len(rows) > 0:
+            col1, col2, col3 = st.columns([1, 1, 2])
+            with col1:
+                page_size = st.selectbox("Rows per page", [25, 50, 100])
+            pages = -(-len(rows) // page_size)
+            # Keep the page in range when filters shrink the result
+            st.session_state["explorer_page"] = min(
+                st.session_state.get("explorer_page", 1), pages
+            )
+            with col2:
+                page = st.number_input(
+                    "Page", min_value=1, max_value=pages, key="explorer_page"
                 )
-                fig_wordlist.update_yaxes(
-                    gridcolor="rgba(128,128,128,0.1)",
-                    zerolinecolor="rgba(128,128,128,0.2)",
+            with col3:
+                first = (page - 1) * page_size + 1
+                st.caption(
+                    f"Sessions {first}-{min(page * page_size, len(rows))} of {len(rows)}"
                 )
 
-                st.plotly_chart(fig_wordlist, use_container_width=True)
+            page_data = session_index.page(rows, page, page_size)
+            columns = [
+                column
+                for column in ["date", "mode", "wordList", "wpm", "accuracy", "score", "timeLeft", "totalTime", "username"]
+                if column in page_data.columns
+            ]
+            st.dataframe(
+                page_data[columns],
+                column_config={
+                    "date": st.column_config.DatetimeColumn("Date", format="YYYY-MM-DD HH:mm:ss"),
+                    "mode": "Game Mode",
+                    "wordList": "Word List",
+                    "wpm": "WPM",
+                    "accuracy": st.column_config.NumberColumn("Accuracy (%)", format="%.1f"),
+                    "score": st.column_config.NumberColumn("Score", format="%.0f"),
+                    "timeLeft": "Time Left",
+                    "totalTime": "Total Time",
+                    "username": "User",
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+        else:
+            st.info("No sessions match the current selection.")
     else:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             st.error("Failed to load data. Please check your JSON file format.")
 else:
+    # Let the shared cache evict this session's dataset once it is unused
+    release_dataset()
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         st.info("Please upload your typing game data JSON file to begin analysis.")
@@ -897,9 +2030,28 @@ else:
             
             - Your overall typing performance metrics (average WPM, accuracy, and more)
             - WPM trends over time with a moving average
+            - Practice patterns by weekday and hour of day
             - Performance comparison across different game modes
             - Performance comparison across different word lists
+            - WPM and accuracy percentiles per game mode, word list and user
+            - A searchable explorer of your individual sessions
             
             Simply upload your typing game data in JSON format to get started!
             """
         )
+
+# Live statistics for the process-wide dataset cache
+cache_stats = get_shared_cache().stats()
+with st.expander("Shared cache statistics"):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cached Datasets", cache_stats["datasets"])
+    with col2:
+        st.metric("Active Sessions", cache_stats["sessions"])
+    with col3:
+        st.metric(
+            "Memory Used",
+            f"{cache_stats['bytes'] / 1024**2:.1f} / {cache_stats['budget_bytes'] / 1024**2:.0f} MB",
+        )
+    with col4:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
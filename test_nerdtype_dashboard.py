@@ -0,0 +1,495 @@
+"""Reference checks for the dashboard's analytics helpers.
+
+Each fast implementation is compared against a naive or pandas version of
+the same computation on random data.
+
+    python -m pytest test_nerdtype_dashboard.py
+"""
+
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Importing the app runs the Streamlit script in bare mode, which loads its
+# images relative to the working directory
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+import nerdtype_dashboard as app  # noqa: E402
+
+
+def synthetic_sessions(n, seed):
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, 90 * 24 * 3600, size=n))
+    return pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(offsets, unit="s"),
+        "mode": rng.choice(["Classic Mode", "Speedrunner Mode", "Zen Mode"], size=n),
+        "wordList": rng.choice(["english", "finnish"], size=n),
+        "username": "test-user",
+        "wpm": rng.integers(20, 140, size=n).astype(float),
+        "accuracy": rng.integers(700, 1001, size=n) / 10,
+    })
+
+
+def raw_record(**fields):
+    record = {
+        "date": "07/05/2025, 09:21:00",
+        "wpm": 65,
+        "accuracy": "94.5%",
+        "mode": "Classic Mode",
+        "wordList": "english",
+        "timeLeft": 11,
+        "score": 667,
+    }
+    record.update(fields)
+    return record
+
+
+def test_validate_sessions_coerces_fields():
+    df, rejected = app.validate_sessions(pd.DataFrame([
+        raw_record(),
+        raw_record(mode="Zen Mode", score=None, timeLeft=None, totalTime="120"),
+    ]))
+    assert rejected.empty
+    assert df["wpm"].tolist() == [65, 65]
+    assert df["accuracy"].tolist() == [94.5, 94.5]
+    assert df["date"].iloc[0] == pd.Timestamp("2025-05-07 09:21:00")
+    assert df["is_zen_mode"].tolist() == [False, True]
+    assert df["timeLeft"].tolist() == [11, 0]
+    assert np.isnan(df["score"].iloc[1]) and df["totalTime"].iloc[1] == 120
+
+
+@pytest.mark.parametrize("fields, reason", [
+    ({"date": "2025-05-07"}, "invalid date"),
+    ({"wpm": "fast"}, "invalid wpm"),
+    ({"wpm": -1}, "invalid wpm"),
+    ({"wpm": float("inf")}, "invalid wpm"),
+    ({"wpm": 1e200}, "invalid wpm"),
+    ({"accuracy": "101%"}, "invalid accuracy"),
+    ({"accuracy": None}, "invalid accuracy"),
+    ({"mode": " "}, "missing mode"),
+    ({"wordList": None}, "missing word list"),
+    ({"date": None, "wpm": -1}, "invalid date"),
+])
+def test_validate_sessions_quarantines_bad_records(fields, reason):
+    df, rejected = app.validate_sessions(pd.DataFrame([raw_record(), raw_record(**fields)]))
+    assert len(df) == 1
+    assert rejected["reason"].tolist() == [reason]
+
+
+def test_validate_sessions_treats_overflowing_scores_as_missing():
+    df, rejected = app.validate_sessions(pd.DataFrame([raw_record(score=float("inf"))]))
+    assert rejected.empty
+    assert np.isnan(df["score"].iloc[0])
+
+
+def test_validate_sessions_requires_fields():
+    with pytest.raises(ValueError, match="wordList"):
+        app.validate_sessions(pd.DataFrame([{"date": "07/05/2025, 09:21:00", "wpm": 60}]))
+
+
+def kilobyte():
+    return np.zeros(125)  # 1000 bytes
+
+
+def test_shared_cache_builds_each_dataset_once():
+    cache = app.SharedFrameCache(budget_bytes=10_000)
+    builds = []
+    first = cache.fetch("a", lambda: builds.append("a") or kilobyte(), acquire=True)
+    second = cache.fetch("a", lambda: builds.append("a") or kilobyte(), acquire=True)
+    assert second is first and builds == ["a"]
+    stats = cache.stats()
+    assert stats["sessions"] == 2 and stats["bytes"] == 1000
+    assert stats["hit_rate"] == 0.5
+
+
+def test_shared_cache_counts_aggregates_once():
+    cache = app.SharedFrameCache(budget_bytes=10_000)
+    cache.fetch("a", kilobyte)
+    computed = []
+    for _ in range(3):
+        cache.aggregate("a", "stats", lambda: computed.append(1) or kilobyte())
+    assert len(computed) == 1
+    assert cache.stats()["bytes"] == 2000
+
+
+def test_shared_cache_release_is_queued():
+    cache = app.SharedFrameCache(budget_bytes=10_000)
+    cache.fetch("a", kilobyte, acquire=True)
+    # Releasing must not take the lock, which the releasing thread may hold
+    with cache._lock:
+        cache.release("a")
+    assert cache._entries["a"]["refs"] == 1
+    assert cache.stats()["sessions"] == 0
+
+
+def test_dataset_lease_releases_when_collected():
+    cache = app.SharedFrameCache(budget_bytes=10_000)
+    cache.fetch("a", kilobyte, acquire=True)
+    lease = app.DatasetLease(cache, "a")
+    del lease
+    gc.collect()
+    assert cache.stats()["sessions"] == 0
+
+
+def test_shared_cache_evicts_least_recently_used():
+    cache = app.SharedFrameCache(budget_bytes=2500)
+    cache.fetch("a", kilobyte)
+    cache.fetch("b", kilobyte)
+    cache.fetch("c", kilobyte)
+    assert list(cache._entries) == ["b", "c"] and cache.evictions == 1
+
+
+def test_shared_cache_keeps_datasets_in_use():
+    cache = app.SharedFrameCache(budget_bytes=2500)
+    cache.fetch("a", kilobyte, acquire=True)
+    cache.fetch("b", kilobyte)
+    cache.fetch("c", kilobyte)
+    assert list(cache._entries) == ["a", "c"]
+    # Over budget with every entry in use, nothing is evicted
+    cache.fetch("c", kilobyte, acquire=True)
+    cache.fetch("d", kilobyte, acquire=True)
+    assert list(cache._entries) == ["a", "c", "d"]
+    cache.release("a")
+    cache.stats()
+    assert list(cache._entries) == ["c", "d"]
+
+
+def test_shared_cache_aggregate_hits_refresh_recency():
+    cache = app.SharedFrameCache(budget_bytes=3500)
+    cache.fetch("a", lambda: np.zeros(0))
+    cache.aggregate("a", "stats", kilobyte)
+    cache.fetch("b", kilobyte)
+    cache.aggregate("a", "stats", kilobyte)
+    cache.fetch("c", kilobyte)
+    cache.fetch("d", kilobyte)
+    assert list(cache._entries) == ["a", "c", "d"]
+
+
+@pytest.mark.parametrize("values, dtype", [
+    ([1, 2, 255], np.uint8),
+    ([-3.0, 0.0, 120.0], np.int8),
+    (np.arange(40000), np.uint16),
+    ([-40000, 40000], np.int32),
+])
+def test_compact_array_narrows_whole_numbers(values, dtype):
+    compact = app.compact_array(values)
+    assert compact.dtype == dtype
+    np.testing.assert_array_equal(compact, values)
+
+
+@pytest.mark.parametrize("values", [
+    [90.2, 64.5],
+    [60.0, np.nan],
+    [1.0, np.inf],
+    [2**40, 1],
+    [True, False],
+    [],
+    ["Classic Mode"],
+    5,
+])
+def test_compact_array_keeps_other_values(values):
+    compact = app.compact_array(values)
+    if isinstance(compact, np.ndarray):
+        assert compact.dtype == np.asarray(values).dtype
+        np.testing.assert_array_equal(compact, values)
+    else:
+        assert compact is values
+
+
+def test_compact_figure_narrows_integral_float_traces():
+    fig = app.go.Figure(app.go.Scatter(x=np.array([1.0, 2.0]), y=np.array([90.2, 91.5])))
+    app.compact_figure(fig)
+    assert fig.data[0].x.dtype == np.uint8
+    np.testing.assert_array_equal(fig.data[0].y, [90.2, 91.5])
+
+
+def stepped_series(n, seed):
+    """WPM-like series with a few shifts in mean and variance."""
+    rng = np.random.default_rng(seed)
+    bounds = np.sort(rng.choice(np.arange(5, n - 5), size=3, replace=False))
+    means = rng.uniform(40, 90, size=4)
+    spreads = rng.uniform(1, 8, size=4)
+    segment = np.searchsorted(bounds, np.arange(n), side="right")
+    return rng.normal(means[segment], spreads[segment])
+
+
+def optimal_partition(cost, n, penalty, min_size):
+    """Changepoints minimizing total cost plus penalty, by exhaustive DP."""
+    best = [0.0] + [np.inf] * n
+    previous = [0] * (n + 1)
+    for end in range(min_size, n + 1):
+        for start in range(0, end - min_size + 1):
+            if start and start < min_size:
+                continue
+            total = best[start] + float(cost(start, end)) + (penalty if start else 0.0)
+            if total < best[end]:
+                best[end], previous[end] = total, start
+    changepoints = []
+    end = previous[n]
+    while end > 0:
+        changepoints.append(end)
+        end = previous[end]
+    return sorted(changepoints)
+
+
+def greedy_segmentation(cost, n, penalty, min_size):
+    """Binary segmentation evaluating every split one at a time."""
+    changepoints = []
+    pending = [(0, n)]
+    while pending:
+        start, end = pending.pop()
+        gains = {
+            split: float(cost(start, end) - cost(start, split) - cost(split, end))
+            for split in range(start + min_size, end - min_size + 1)
+        }
+        if gains:
+            split = max(gains, key=gains.get)
+            if gains[split] > penalty:
+                changepoints.append(split)
+                pending += [(start, split), (split, end)]
+    return sorted(changepoints)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_segment_cost_matches_direct_variance(seed):
+    x = stepped_series(60, seed)
+    cost = app.segment_cost(x)
+    floor = max(x.var() * 1e-3, 1e-6)
+    for start, end in [(0, 60), (3, 17), (20, 25), (41, 60)]:
+        expected = (end - start) * np.log(max(x[start:end].var(), floor))
+        assert cost(start, end) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pelt_finds_optimal_partition(seed):
+    x = stepped_series(80, seed)
+    penalty = app.CHANGEPOINT_PENALTY * np.log(len(x))
+    cost = app.segment_cost(x)
+    changepoints = app.pelt(cost, len(x), penalty, app.CHANGEPOINT_MIN_SESSIONS)
+    expected = optimal_partition(cost, len(x), penalty, app.CHANGEPOINT_MIN_SESSIONS)
+    assert sorted(changepoints) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_binary_segmentation_matches_greedy_search(seed):
+    x = stepped_series(80, seed)
+    penalty = app.CHANGEPOINT_PENALTY * np.log(len(x))
+    cost = app.segment_cost(x)
+    changepoints = app.binary_segmentation(cost, len(x), penalty, app.CHANGEPOINT_MIN_SESSIONS)
+    expected = greedy_segmentation(cost, len(x), penalty, app.CHANGEPOINT_MIN_SESSIONS)
+    assert sorted(changepoints) == expected
+
+
+def test_detect_changepoints_covers_series():
+    x = stepped_series(80, 0)
+    segments = app.detect_changepoints(x)
+    assert segments[0][0] == 0 and segments[-1][1] == len(x)
+    assert all(a_end == b_start for (_, a_end), (b_start, _) in zip(segments, segments[1:]))
+    assert all(end - start >= app.CHANGEPOINT_MIN_SESSIONS for start, end in segments)
+    assert app.detect_changepoints(x[:7]) == [(0, 7)]
+
+
+@pytest.mark.parametrize("n", [50, 200, 1000, 20000])
+def test_detect_changepoints_rarely_splits_stationary_series(n):
+    seeds = range(40)
+    split = sum(
+        len(app.detect_changepoints(np.random.default_rng(seed).normal(60, 8, n))) > 1
+        for seed in seeds
+    )
+    assert split / len(seeds) <= 0.1
+
+
+def test_detect_changepoints_finds_clear_jump():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(50, 5, 100), rng.normal(70, 5, 100)])
+    assert app.detect_changepoints(x) == [(0, 100), (100, 200)]
+
+
+@pytest.mark.parametrize("bad", [np.inf, np.nan, 1e200])
+def test_detect_changepoints_ignores_non_finite_series(bad):
+    x = stepped_series(80, 0)
+    x[40] = bad
+    assert app.detect_changepoints(x) == [(0, 80)]
+
+
+def test_pelt_survives_nan_costs():
+    def cost(start, end):
+        return np.full(np.shape(start), np.nan)
+
+    assert app.pelt(cost, 30, 10.0, app.CHANGEPOINT_MIN_SESSIONS) == []
+
+
+def test_practice_grid_matches_pivot_table():
+    df = synthetic_sessions(2000, 4)
+    grid = app.practice_grid(df)
+    cells = pd.MultiIndex.from_product([range(7), range(24)])
+    grouped = df.groupby([df["date"].dt.weekday, df["date"].dt.hour])
+    expected_count = grouped.size().reindex(cells, fill_value=0)
+    np.testing.assert_array_equal(grid["count"], expected_count.to_numpy().reshape(7, 24))
+    for column in ["wpm", "accuracy"]:
+        expected = grouped[column].mean().reindex(cells)
+        np.testing.assert_allclose(grid[column], expected.to_numpy().reshape(7, 24))
+
+
+def test_practice_grid_leaves_empty_cells_blank():
+    df = synthetic_sessions(1, 0)
+    df["date"] = pd.Timestamp("2024-01-07 23:30")  # a Sunday
+    grid = app.practice_grid(df)
+    assert grid["count"].sum() == 1 and grid["count"][6, 23] == 1
+    assert grid["wpm"][6, 23] == df["wpm"].iloc[0]
+    assert np.isnan(grid["wpm"]).sum() == 7 * 24 - 1
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_sliding_max_matches_rescan(window):
+    values = np.random.default_rng(window).integers(0, 50, size=200).astype(float)
+    expected = [values[max(0, i - window + 1):i + 1].max() for i in range(len(values))]
+    np.testing.assert_array_equal(app.sliding_max(values, window), expected)
+
+
+@pytest.mark.parametrize("days", [1, 7, 30])
+def test_sliding_max_by_time_matches_rescan(days):
+    df = synthetic_sessions(300, days)
+    times, values = df["date"].to_numpy(), df["wpm"].to_numpy()
+    span = np.timedelta64(days, "D")
+    expected = [values[(times > t - span) & (times <= t)].max() for t in times]
+    np.testing.assert_array_equal(app.sliding_max_by_time(times, values, span), expected)
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2024-01-01", "2024-03-31"),
+    ("2024-02-10", "2024-02-20"),
+    ("2024-02-14", "2024-02-14"),
+    ("2023-12-01", "2024-01-15"),
+    ("2025-01-01", "2025-01-31"),
+])
+def test_period_table_matches_groupby(start, end):
+    df = synthetic_sessions(500, 1)
+    stats = app.PeriodTable.from_frame(df).range_stats(start, end)
+
+    days = df["date"].dt.normalize()
+    in_range = df[(days >= start) & (days <= end)]
+    expected = in_range.groupby(["mode", "wordList"]).agg(
+        sessions=("wpm", "size"),
+        wpm_mean=("wpm", "mean"),
+        wpm_std=("wpm", "std"),
+        accuracy_mean=("accuracy", "mean"),
+        accuracy_std=("accuracy", "std"),
+    )
+    stats = stats.set_index(["mode", "wordList"])
+    expected = expected.reindex(stats.index)
+    expected["sessions"] = expected["sessions"].fillna(0).astype(np.int64)
+    pd.testing.assert_frame_equal(
+        stats, expected, check_dtype=False, check_column_type=False, check_index_type=False
+    )
+
+
+@pytest.mark.parametrize("metric", ["wpm", "accuracy"])
+def test_sketch_quantiles_match_inverted_cdf(metric):
+    df = synthetic_sessions(1000, 2)
+    sketches = app.SessionSketches.from_frame(df)
+    summary = sketches.summary("mode").set_index("Game Mode")
+    label = {"wpm": "WPM", "accuracy": "Accuracy"}[metric]
+    for mode, group in df.groupby("mode"):
+        for q in app.SKETCH_QUANTILES:
+            expected = np.quantile(group[metric], q, method="inverted_cdf")
+            assert summary.loc[mode, f"{label} p{q * 100:g}"] == pytest.approx(expected)
+    overall = sketches.overall(metric)
+    for q in app.SKETCH_QUANTILES:
+        assert overall[q] == pytest.approx(np.quantile(df[metric], q, method="inverted_cdf"))
+
+
+def assert_sketches_equal(left, right):
+    np.testing.assert_array_equal(left.months, right.months)
+    assert left.groups.keys() == right.groups.keys()
+    for dimension in left.groups:
+        np.testing.assert_array_equal(left.groups[dimension], right.groups[dimension])
+    assert left.counts.keys() == right.counts.keys()
+    for key in left.counts:
+        np.testing.assert_array_equal(left.counts[key], right.counts[key])
+    assert left.clipped == right.clipped
+
+
+def test_merged_sketches_equal_sketches_of_whole_frame():
+    df = synthetic_sessions(1000, 3)
+    df.loc[df.index[:5], "wpm"] = 450
+    # The halves cover different months and different sets of groups
+    early = df[df["date"] < "2024-02-10"]
+    late = df[(df["date"] >= "2024-02-10") & (df["mode"] != "Zen Mode")]
+    whole = pd.concat([early, late])
+    sketches = app.SessionSketches
+    merged = sketches.from_frame(early).merge(sketches.from_frame(late))
+    assert_sketches_equal(merged, sketches.from_frame(whole))
+    assert merged.clipped["wpm"] == 5
+    assert_sketches_equal(
+        sketches.from_frame(late).merge(sketches.from_frame(early)), merged
+    )
+
+
+def test_sketch_quantiles_of_empty_histogram_are_nan():
+    histogram = np.zeros((2, 401), dtype=np.int32)
+    histogram[0, 60] = 3
+    quantiles = app.SessionSketches.quantiles(histogram, "wpm")
+    assert quantiles[0.5][0] == 60
+    assert np.isnan(quantiles[0.5][1])
+
+
+def indexed_sessions(n, seed):
+    df = synthetic_sessions(n, seed)
+    rng = np.random.default_rng(seed)
+    df["score"] = np.where(
+        df["mode"] == "Zen Mode", np.nan, rng.integers(100, 900, size=n)
+    ).astype(float)
+    # Repeated values make ties in every sort column
+    df["wpm"] = (df["wpm"] // 10) * 10
+    return df
+
+
+@pytest.mark.parametrize("sort", ["date", "wpm", "accuracy", "score"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("modes, word_lists, day", [
+    (None, None, None),
+    (["Classic Mode"], None, None),
+    (None, ["finnish"], None),
+    (["Zen Mode", "Speedrunner Mode"], ["english"], None),
+    (None, None, "2024-02-14"),
+    (["Classic Mode"], None, "2024-02-14"),
+    ([], None, None),
+    (None, None, "2025-01-01"),
+])
+def test_session_index_query_matches_pandas(sort, descending, modes, word_lists, day):
+    df = indexed_sessions(600, 5)
+    rows = app.SessionIndex(df).query(sort, descending, modes, word_lists, day)
+
+    selected = pd.Series(True, index=df.index)
+    if modes is not None:
+        selected &= df["mode"].isin(modes)
+    if word_lists is not None:
+        selected &= df["wordList"].isin(word_lists)
+    if day is not None:
+        selected &= df["date"].dt.normalize() == pd.Timestamp(day)
+    expected = df[selected].sort_values(
+        sort, ascending=not descending, kind="stable", na_position="last"
+    )
+    assert sorted(rows) == sorted(expected.index)
+    # Ties may come in either order, but the sorted values must match
+    result = df[sort].to_numpy()[rows]
+    np.testing.assert_array_equal(result, expected[sort].to_numpy())
+
+
+def test_session_index_pages_through_rows():
+    df = indexed_sessions(60, 6)
+    index = app.SessionIndex(df)
+    rows = index.query("wpm", descending=True)
+    pages = [index.page(rows, page, 25) for page in [1, 2, 3]]
+    assert [len(page) for page in pages] == [25, 25, 10]
+    assert pd.concat(pages).index.tolist() == df.index[rows].tolist()
+
+
+def test_combine_filters():
+    assert app.combine_filters([], []) is None
+    assert app.combine_filters(["Zen Mode"], []) == ["Zen Mode"]
+    assert sorted(app.combine_filters(["a", "b"], ["b", "c", "a"])) == ["a", "b"]
+    assert app.combine_filters(["a"], ["b"]) == []